@@ -5,32 +5,159 @@ Handles data fetching from CoinGecko, Alpha Vantage, TwelveData and other APIs.
 
 import aiohttp
 import asyncio
+import bisect
+import heapq
 import logging
-from typing import Dict, List, Optional, Tuple
+import socket
+import time
+import numpy as np
+import pandas as pd
+from dataclasses import dataclass, field
+from typing import Any, Dict, List, Optional, Tuple
 from datetime import datetime, timedelta
-import json
+
+try:
+    import orjson
+except ImportError:  # orjson is optional, fall back to stdlib
+    import json as orjson
 
 from config import Config
+from cache import FileCache
+
+logger = logging.getLogger(__name__)
+
+# Process-wide HTTP session shared by every DataFetcher so TCP/TLS connections
+# to the data providers are pooled and kept alive between fetches.
+_shared_session: Optional[aiohttp.ClientSession] = None
+_shared_session_loop: Optional[asyncio.AbstractEventLoop] = None
+
+def _create_tcp_socket(addr_info: Tuple) -> socket.socket:
+    """
+    Socket factory for the shared connector with Nagle disabled and TCP keep-alive on.
+    
+    Args:
+        addr_info: Address info tuple from getaddrinfo()
+        
+    Returns:
+        Configured, unconnected socket
+    """
+    family, sock_type, proto, _, _ = addr_info
+    sock = socket.socket(family=family, type=sock_type, proto=proto)
+    sock.setsockopt(socket.IPPROTO_TCP, socket.TCP_NODELAY, 1)
+    sock.setsockopt(socket.SOL_SOCKET, socket.SO_KEEPALIVE, 1)
+    return sock
+
+async def get_shared_session() -> aiohttp.ClientSession:
+    """
+    Get the shared aiohttp session, creating it on first use.
+    
+    A session is bound to the event loop it was created in, so a new one is
+    created if the previous session was closed or belongs to another loop.
+    
+    Returns:
+        Shared ClientSession for the running event loop
+    """
+    global _shared_session, _shared_session_loop
+    
+    loop = asyncio.get_running_loop()
+    if _shared_session is None or _shared_session.closed or _shared_session_loop is not loop:
+        connector = aiohttp.TCPConnector(
+            limit=32,
+            limit_per_host=8,
+            ttl_dns_cache=300,
+            keepalive_timeout=75,
+            force_close=False,
+            socket_factory=_create_tcp_socket
+        )
+        _shared_session = aiohttp.ClientSession(
+            connector=connector,
+            timeout=aiohttp.ClientTimeout(total=Config.API_TIMEOUT)
+        )
+        _shared_session_loop = loop
+    
+    return _shared_session
+
+async def close_shared_session():
+    """Close the shared aiohttp session if it is open."""
+    global _shared_session, _shared_session_loop
+    
+    if _shared_session and not _shared_session.closed:
+        await _shared_session.close()
+    _shared_session = None
+    _shared_session_loop = None
+
+@dataclass(slots=True)
+class AssetData:
+    """Market data collected for one asset during a fetch."""
+    
+    symbol: str
+    current_price: float = 0
+    price_data: np.ndarray = field(default_factory=lambda: np.empty(0))
+    volume_data: np.ndarray = field(default_factory=lambda: np.empty(0))
+    timestamp: float = field(default_factory=time.time)
+    sources: List[str] = field(default_factory=list)
+    by_source: Dict[str, Dict] = field(default_factory=dict)
+    price_source: Optional[str] = None
+    
+    def to_dict(self) -> Dict:
+        """Convert to the dict returned by DataFetcher.get_asset_data."""
+        return {
+            'symbol': self.symbol,
+            'current_price': self.current_price,
+            'price_data': self.price_data,
+            'volume_data': self.volume_data,
+            'timestamp': datetime.fromtimestamp(self.timestamp).isoformat(),
+            'sources': self.sources,
+            'price_source': self.price_source
+        }
+
+@dataclass(slots=True)
+class BarSeries:
+    """Recent bars kept per symbol so later fetches only request newer ones."""
+    
+    timestamps: List[str]
+    prices: List[float]
+    volumes: List[float]
+    fetched_at: float
 
 class DataFetcher:
     """Handles fetching market data from multiple API sources."""
     
-    def __init__(self):
-        self.config = Config()
-        self.logger = logging.getLogger(__name__)
-        self.session = None
+    # Bars kept per TwelveData series
+    TWELVEDATA_BARS = 50
+    
+    def __init__(self, session: Optional[aiohttp.ClientSession] = None):
+        """
+        Initialize the data fetcher.
+        
+        Args:
+            session: Externally managed session to use instead of the shared one
+        """
+        self.session = session
+        self._external_session = session is not None
+        
+        # TTL cache of decoded API responses keyed by (symbol, provider)
+        self._response_cache: Dict[Tuple[str, str], Tuple[float, Any]] = {}
+        self._cache_locks: Dict[Tuple[str, str], asyncio.Lock] = {}
+        
+        # Bar series responses on disk, valid until the next bar closes
+        self._ohlcv_cache = FileCache(Config.OHLCV_CACHE_DIR, Config.OHLCV_CACHE_TTL)
+        
+        # Latest TwelveData bars per symbol, extended with tail-only requests
+        self._bar_store: Dict[str, BarSeries] = {}
+        
+        # Backoff after failed requests keyed by (symbol, provider): (retry after, backoff seconds)
+        self._failures: Dict[Tuple[str, str], Tuple[float, float]] = {}
     
     async def __aenter__(self):
         """Async context manager entry."""
-        self.session = aiohttp.ClientSession(
-            timeout=aiohttp.ClientTimeout(total=self.config.API_TIMEOUT)
-        )
+        if not self._external_session:
+            self.session = await get_shared_session()
         return self
     
     async def __aexit__(self, exc_type, exc_val, exc_tb):
-        """Async context manager exit."""
-        if self.session:
-            await self.session.close()
+        """Async context manager exit (the shared session outlives this fetcher)."""
+        pass
     
     async def get_asset_data(self, symbol: str) -> Dict:
         """
@@ -42,272 +169,458 @@ class DataFetcher:
         Returns:
             Dict containing price data, volume data, and metadata
         """
-        if not self.session:
-            self.session = aiohttp.ClientSession(
-                timeout=aiohttp.ClientTimeout(total=self.config.API_TIMEOUT)
-            )
-        
-        data = {
-            'symbol': symbol,
-            'current_price': 0,
-            'price_data': [],
-            'volume_data': [],
-            'timestamp': datetime.now().isoformat(),
-            'sources': []
-        }
+        if __debug__ and self.session is None:
+            raise RuntimeError("DataFetcher must be entered with 'async with' before fetching")
+        
+        data = AssetData(symbol)
         
         try:
             # Determine which APIs to use based on symbol type
-            if self.config.is_crypto_symbol(symbol):
+            if Config.is_crypto_symbol(symbol):
                 await self._fetch_crypto_data(symbol, data)
-            elif self.config.is_forex_symbol(symbol):
+            elif Config.is_forex_symbol(symbol):
                 await self._fetch_forex_data(symbol, data)
-            elif self.config.is_commodity_symbol(symbol):
+            elif Config.is_commodity_symbol(symbol):
                 await self._fetch_commodity_data(symbol, data)
             
+            self._select_source(data)
+            
             # Ensure we have some price data
-            if not data['price_data']:
-                self.logger.warning(f"No price data obtained for {symbol}")
+            if len(data.price_data) == 0:
+                logger.warning(f"No price data obtained for {symbol}")
             
-            return data
+            return data.to_dict()
             
         except Exception as e:
-            self.logger.error(f"Error fetching data for {symbol}: {str(e)}")
-            return data
+            logger.error(f"Error fetching data for {symbol}: {str(e)}")
+            return data.to_dict()
     
-    async def _fetch_crypto_data(self, symbol: str, data: Dict):
-        """Fetch cryptocurrency data from multiple sources."""
-        tasks = [
-            self._fetch_coingecko_data(symbol, data),
-            self._fetch_twelvedata_crypto(symbol, data)
-        ]
+    async def prefetch_crypto_prices(self, symbols: List[str]):
+        """
+        Fetch current prices for all crypto symbols in one CoinGecko request.
+        
+        The combined response is stored in the response cache under each
+        symbol's 'coingecko_price' key, so the per-symbol fetchers reuse it
+        instead of issuing one request per coin.
+        
+        Args:
+            symbols: Trading symbols to prefetch (non-crypto symbols are ignored)
+        """
+        crypto_symbols = [s for s in symbols if Config.is_crypto_symbol(s)]
+        if not crypto_symbols:
+            return
+        
+        try:
+            params = {
+                'ids': ','.join(Config.get_symbol_for_api(s, 'coingecko') for s in crypto_symbols),
+                'vs_currencies': 'usd',
+                'include_24hr_vol': 'true'
+            }
+            
+            async with self.session.get(Config.API_ENDPOINTS['coingecko_price'], params=params) as response:
+                if response.status != 200:
+                    logger.warning(f"CoinGecko batch price request failed: HTTP {response.status}")
+                    return
+                payload = orjson.loads(await response.read())
+            
+            expires_at = time.monotonic() + Config.API_CACHE_TTL
+            for symbol in crypto_symbols:
+                self._response_cache[(symbol, 'coingecko_price')] = (expires_at, payload)
+                
+        except Exception as e:
+            logger.warning(f"CoinGecko batch price request failed: {str(e)}")
+    
+    def _record_source(self, data: AssetData, provider: str, prices: List[float], volumes: List[float], last: float):
+        """
+        Store one provider's series under data.by_source.
         
-        # Run API calls concurrently
-        results = await asyncio.gather(*tasks, return_exceptions=True)
+        Args:
+            data: Asset data being filled
+            provider: Provider name as listed in Config.SOURCE_PRIORITY
+            prices: Chronological price series
+            volumes: Chronological volume series
+            last: Latest price reported by the provider
+        """
+        data.by_source[provider] = {'prices': prices, 'volumes': volumes, 'last': last}
+    
+    def _select_source(self, data: AssetData):
+        """
+        Fill price_data, volume_data and current_price from a single provider.
+        
+        Series from different providers have different cadences, so rather than
+        mixing them the highest-priority provider with a price series wins. If no
+        provider returned a series, the best available spot price is still used.
+        
+        Args:
+            data: Asset data with by_source filled in by the fetchers
+        """
+        by_source = data.by_source
         
-        # Log any errors
-        for i, result in enumerate(results):
-            if isinstance(result, Exception):
-                self.logger.warning(f"Crypto API {i} failed for {symbol}: {str(result)}")
+        for provider in Config.SOURCE_PRIORITY:
+            source = by_source.get(provider)
+            if source and source['prices']:
+                # Hand the series on as float arrays so consumers can reduce them in C
+                data.price_data = np.asarray(source['prices'], dtype=np.float64)
+                data.volume_data = np.asarray(source['volumes'], dtype=np.float64)
+                data.current_price = source['last']
+                data.price_source = provider
+                return
+        
+        for provider in Config.SOURCE_PRIORITY:
+            source = by_source.get(provider)
+            if source and source['last']:
+                data.current_price = source['last']
+                return
     
-    async def _fetch_forex_data(self, symbol: str, data: Dict):
-        """Fetch forex data from multiple sources."""
-        tasks = [
-            self._fetch_alpha_vantage_forex(symbol, data),
-            self._fetch_twelvedata_forex(symbol, data)
-        ]
+    async def _get_json(self, provider: str, symbol: str, url: str, params: Dict, bar_seconds: Optional[int] = None, series_key: Optional[str] = None) -> Optional[Any]:
+        """
+        GET a JSON endpoint, serving repeated requests from a TTL cache.
+        
+        A lock per cache key makes concurrent callers wait for the first
+        request instead of all hitting the API at once. Bar series requests
+        (bar_seconds given) are also kept on disk keyed by the current bar,
+        so they are downloaded once per bar close rather than once per cycle;
+        only responses containing series_key are persisted, so rate-limit
+        notes are not cached for a whole bar. Failed requests back the key
+        off with a doubling delay so dead symbols are not retried every cycle.
         
-        results = await asyncio.gather(*tasks, return_exceptions=True)
+        Args:
+            provider: Provider name used in the cache key (e.g., 'coingecko_price')
+            symbol: Trading symbol used in the cache key
+            url: Endpoint URL
+            params: Query parameters
+            bar_seconds: Bar interval of a bar series endpoint
+            series_key: Key a valid bar series response contains
+            
+        Returns:
+            Decoded JSON payload, or None if the API did not return HTTP 200
+            or the key is backing off after failures
+        """
+        key = (symbol, provider)
+        lock = self._cache_locks.setdefault(key, asyncio.Lock())
         
-        for i, result in enumerate(results):
-            if isinstance(result, Exception):
-                self.logger.warning(f"Forex API {i} failed for {symbol}: {str(result)}")
+        async with lock:
+            cached = self._response_cache.get(key)
+            if cached and cached[0] > time.monotonic():
+                logger.debug(f"X-Cache: HIT | {provider} | {symbol}")
+                return cached[1]
+            
+            logger.debug(f"X-Cache: MISS | {provider} | {symbol}")
+            
+            disk_key = None
+            if bar_seconds:
+                query = '&'.join(f"{k}={v}" for k, v in sorted(params.items()) if k != 'apikey')
+                disk_key = f"{provider}|{symbol}|{query}|{int(time.time() // bar_seconds)}"
+                body = self._ohlcv_cache.get(disk_key)
+                if body is not None:
+                    payload = orjson.loads(body)
+                    self._response_cache[key] = (time.monotonic() + Config.API_CACHE_TTL, payload)
+                    return payload
+            
+            failure = self._failures.get(key)
+            if failure and failure[0] > time.monotonic():
+                logger.debug(f"Backing off | {provider} | {symbol}")
+                return None
+            
+            try:
+                async with self.session.get(url, params=params) as response:
+                    if response.status != 200:
+                        self._record_failure(key)
+                        return None
+                    body = await response.read()
+                
+                payload = orjson.loads(body)
+            except Exception:
+                self._record_failure(key)
+                raise
+            
+            has_series = isinstance(payload, dict) and bool(payload.get(series_key))
+            if series_key and not has_series:
+                self._record_failure(key)
+            else:
+                self._failures.pop(key, None)
+            
+            if disk_key and has_series:
+                self._ohlcv_cache.set(disk_key, body)
+            
+            self._response_cache[key] = (time.monotonic() + Config.API_CACHE_TTL, payload)
+            return payload
     
-    async def _fetch_commodity_data(self, symbol: str, data: Dict):
-        """Fetch commodity data (Gold) from multiple sources.""" 
-        tasks = [
-            self._fetch_alpha_vantage_commodity(symbol, data),
-            self._fetch_twelvedata_commodity(symbol, data)
-        ]
+    def _record_failure(self, key: Tuple[str, str]):
+        """
+        Skip a (symbol, provider) key for a while after a failed request.
         
-        results = await asyncio.gather(*tasks, return_exceptions=True)
+        The delay starts at FAILURE_BACKOFF_MIN and doubles with every
+        consecutive failure up to FAILURE_BACKOFF_MAX; a success clears it.
         
-        for i, result in enumerate(results):
-            if isinstance(result, Exception):
-                self.logger.warning(f"Commodity API {i} failed for {symbol}: {str(result)}")
+        Args:
+            key: (symbol, provider) cache key of the failed request
+        """
+        previous = self._failures.get(key)
+        backoff = min(previous[1] * 2, Config.FAILURE_BACKOFF_MAX) if previous else Config.FAILURE_BACKOFF_MIN
+        self._failures[key] = (time.monotonic() + backoff, backoff)
+        logger.warning(f"{key[1]} request failed for {key[0]}, retrying in {backoff:.0f}s")
+    
+    async def _fetch_crypto_data(self, symbol: str, data: AssetData):
+        """Fetch cryptocurrency data from multiple sources."""
+        # Run API calls concurrently; each fetcher logs and swallows its own errors
+        async with asyncio.TaskGroup() as tg:
+            tg.create_task(self._fetch_coingecko_data(symbol, data))
+            tg.create_task(self._fetch_twelvedata_crypto(symbol, data))
     
-    async def _fetch_coingecko_data(self, symbol: str, data: Dict):
+    async def _fetch_forex_data(self, symbol: str, data: AssetData):
+        """Fetch forex data from multiple sources."""
+        async with asyncio.TaskGroup() as tg:
+            tg.create_task(self._fetch_alpha_vantage_forex(symbol, data))
+            tg.create_task(self._fetch_twelvedata_forex(symbol, data))
+    
+    async def _fetch_commodity_data(self, symbol: str, data: AssetData):
+        """Fetch commodity data (Gold) from multiple sources.""" 
+        async with asyncio.TaskGroup() as tg:
+            tg.create_task(self._fetch_alpha_vantage_commodity(symbol, data))
+            tg.create_task(self._fetch_twelvedata_commodity(symbol, data))
+    
+    async def _fetch_coingecko_data(self, symbol: str, data: AssetData):
         """Fetch data from CoinGecko API."""
         try:
-            coin_id = self.config.get_symbol_for_api(symbol, 'coingecko')
+            coin_id = Config.get_symbol_for_api(symbol, 'coingecko')
             
             # Get current price
-            price_url = self.config.API_ENDPOINTS['coingecko_price']
+            price_url = Config.API_ENDPOINTS['coingecko_price']
             price_params = {
                 'ids': coin_id,
                 'vs_currencies': 'usd',
                 'include_24hr_vol': 'true'
             }
             
-            async with self.session.get(price_url, params=price_params) as response:
-                if response.status == 200:
-                    price_data = await response.json()
-                    
-                    if coin_id in price_data:
-                        current_price = price_data[coin_id]['usd']
-                        data['current_price'] = current_price
-                        data['sources'].append('coingecko_price')
-                        
-                        # Add volume if available
-                        if 'usd_24h_vol' in price_data[coin_id]:
-                            volume = price_data[coin_id]['usd_24h_vol']
-                            data['volume_data'].append(volume)
+            current_price = 0
+            price_data = await self._get_json('coingecko_price', symbol, price_url, price_params)
+            if price_data is not None:
+                if coin_id in price_data:
+                    current_price = price_data[coin_id]['usd']
+                    data.sources.append('coingecko_price')
             
             # Get historical data for technical analysis
-            history_url = self.config.API_ENDPOINTS['coingecko_history'].format(coin_id)
+            history_url = Config.API_ENDPOINTS['coingecko_history'].format(coin_id)
             history_params = {
                 'vs_currency': 'usd',
                 'days': '1',
                 'interval': 'hourly'
             }
             
-            async with self.session.get(history_url, params=history_params) as response:
-                if response.status == 200:
-                    history_data = await response.json()
+            prices = []
+            volumes = []
+            history_data = await self._get_json('coingecko_history', symbol, history_url, history_params, bar_seconds=60 * 60, series_key='prices')
+            if history_data is not None:
+                # Rows are [timestamp, value] pairs; slice the value column in C
+                if history_data.get('prices'):
+                    prices = np.asarray(history_data['prices'], dtype=np.float64)[:, 1].tolist()
+                    data.sources.append('coingecko_history')
                     
-                    if 'prices' in history_data:
-                        prices = [price[1] for price in history_data['prices']]
-                        data['price_data'].extend(prices)
-                        data['sources'].append('coingecko_history')
-                    
-                    if 'total_volumes' in history_data:
-                        volumes = [vol[1] for vol in history_data['total_volumes']]
-                        data['volume_data'].extend(volumes)
+                if history_data.get('total_volumes'):
+                    volumes = np.asarray(history_data['total_volumes'], dtype=np.float64)[:, 1].tolist()
+            
+            if prices or current_price:
+                last = current_price or prices[-1]
+                self._record_source(data, 'coingecko', prices, volumes, last)
                         
         except Exception as e:
-            self.logger.error(f"CoinGecko API error for {symbol}: {str(e)}")
-            raise
+            logger.error(f"CoinGecko API error for {symbol}: {str(e)}")
     
-    async def _fetch_alpha_vantage_forex(self, symbol: str, data: Dict):
+    async def _fetch_alpha_vantage_forex(self, symbol: str, data: AssetData):
         """Fetch forex data from Alpha Vantage."""
-        try:
-            if not self.config.ALPHA_VANTAGE_API_KEY or self.config.ALPHA_VANTAGE_API_KEY == 'demo':
-                self.logger.warning("Alpha Vantage API key not available")
-                return
-            
-            url = self.config.API_ENDPOINTS['alpha_vantage_fx']
-            params = {
-                'function': 'FX_INTRADAY',
-                'from_symbol': symbol.split('/')[0],
-                'to_symbol': symbol.split('/')[1],
-                'interval': '15min',
-                'apikey': self.config.ALPHA_VANTAGE_API_KEY
-            }
-            
-            async with self.session.get(url, params=params) as response:
-                if response.status == 200:
-                    av_data = await response.json()
-                    
-                    if 'Time Series (15min)' in av_data:
-                        time_series = av_data['Time Series (15min)']
-                        
-                        # Extract prices and volumes
-                        prices = []
-                        volumes = []
-                        
-                        for timestamp, values in sorted(time_series.items()):
-                            prices.append(float(values['4. close']))
-                            volumes.append(float(values.get('5. volume', 0)))
-                        
-                        data['price_data'].extend(prices[-50:])  # Last 50 data points
-                        data['volume_data'].extend(volumes[-50:])
-                        
-                        if prices:
-                            data['current_price'] = prices[-1]
-                        
-                        data['sources'].append('alpha_vantage_forex')
-                        
-        except Exception as e:
-            self.logger.error(f"Alpha Vantage Forex API error for {symbol}: {str(e)}")
-            raise
+        base, quote = symbol.split('/', 1)
+        await self._fetch_alpha_vantage(symbol, data, base, quote, 'alpha_vantage_forex')
     
-    async def _fetch_alpha_vantage_commodity(self, symbol: str, data: Dict):
+    async def _fetch_alpha_vantage_commodity(self, symbol: str, data: AssetData):
         """Fetch commodity data from Alpha Vantage."""
+        await self._fetch_alpha_vantage(symbol, data, 'XAU', 'USD', 'alpha_vantage_commodity')
+    
+    async def _fetch_alpha_vantage(self, symbol: str, data: AssetData, from_symbol: str, to_symbol: str, tag: str):
+        """Generic Alpha Vantage FX_INTRADAY fetcher."""
         try:
-            if not self.config.ALPHA_VANTAGE_API_KEY or self.config.ALPHA_VANTAGE_API_KEY == 'demo':
-                self.logger.warning("Alpha Vantage API key not available")
+            if not Config.ALPHA_VANTAGE_API_KEY or Config.ALPHA_VANTAGE_API_KEY == 'demo':
+                logger.warning("Alpha Vantage API key not available")
                 return
             
-            url = self.config.API_ENDPOINTS['alpha_vantage_fx']
+            url = Config.API_ENDPOINTS['alpha_vantage_fx']
             params = {
                 'function': 'FX_INTRADAY',
-                'from_symbol': 'XAU',
-                'to_symbol': 'USD', 
+                'from_symbol': from_symbol,
+                'to_symbol': to_symbol,
                 'interval': '15min',
-                'apikey': self.config.ALPHA_VANTAGE_API_KEY
+                'apikey': Config.ALPHA_VANTAGE_API_KEY
             }
             
-            async with self.session.get(url, params=params) as response:
-                if response.status == 200:
-                    av_data = await response.json()
-                    
-                    if 'Time Series (15min)' in av_data:
-                        time_series = av_data['Time Series (15min)']
+            av_data = await self._get_json(tag, symbol, url, params, bar_seconds=15 * 60, series_key='Time Series (15min)')
+            if av_data is not None:
+                if 'Time Series (15min)' in av_data:
+                    time_series = av_data['Time Series (15min)']
                         
-                        prices = []
-                        volumes = []
+                    # Extract prices and volumes
+                    prices, volumes = self._parse_alpha_vantage_series(time_series)
                         
-                        for timestamp, values in sorted(time_series.items()):
-                            prices.append(float(values['4. close']))
-                            volumes.append(float(values.get('5. volume', 0)))
+                    if prices:
+                        self._record_source(data, 'alpha_vantage', prices, volumes, prices[-1])
                         
-                        data['price_data'].extend(prices[-50:])
-                        data['volume_data'].extend(volumes[-50:])
-                        
-                        if prices:
-                            data['current_price'] = prices[-1]
-                        
-                        data['sources'].append('alpha_vantage_commodity')
+                    data.sources.append(tag)
                         
         except Exception as e:
-            self.logger.error(f"Alpha Vantage Commodity API error for {symbol}: {str(e)}")
-            raise
+            logger.error(f"Alpha Vantage API error for {symbol}: {str(e)}")
+    
+    def _parse_alpha_vantage_series(self, time_series: Dict, limit: int = 50) -> Tuple[List[float], List[float]]:
+        """
+        Parse an Alpha Vantage intraday time series into price and volume lists.
+        
+        Args:
+            time_series: Mapping of timestamp to OHLCV values
+            limit: Number of most recent data points to keep
+            
+        Returns:
+            Tuple of (prices, volumes) in chronological order
+        """
+        if not time_series:
+            return [], []
+        
+        # ISO timestamps sort lexically, so pick the newest keys without a full sort
+        timestamps = heapq.nlargest(limit, time_series)
+        timestamps.reverse()
+        df = pd.DataFrame([time_series[ts] for ts in timestamps])
+        
+        prices = df['4. close'].astype(float).tolist()
+        if '5. volume' in df:
+            volumes = df['5. volume'].astype(float).fillna(0).tolist()
+        else:
+            volumes = [0.0] * len(prices)  # FX series carry no volume
+        
+        return prices, volumes
     
-    async def _fetch_twelvedata_crypto(self, symbol: str, data: Dict):
+    async def _fetch_twelvedata_crypto(self, symbol: str, data: AssetData):
         """Fetch crypto data from TwelveData."""
         await self._fetch_twelvedata_generic(symbol, data, 'crypto')
     
-    async def _fetch_twelvedata_forex(self, symbol: str, data: Dict):
+    async def _fetch_twelvedata_forex(self, symbol: str, data: AssetData):
         """Fetch forex data from TwelveData."""
         await self._fetch_twelvedata_generic(symbol, data, 'forex')
     
-    async def _fetch_twelvedata_commodity(self, symbol: str, data: Dict):
+    async def _fetch_twelvedata_commodity(self, symbol: str, data: AssetData):
         """Fetch commodity data from TwelveData."""
         await self._fetch_twelvedata_generic(symbol, data, 'commodity')
     
-    async def _fetch_twelvedata_generic(self, symbol: str, data: Dict, asset_type: str):
+    async def _fetch_twelvedata_generic(self, symbol: str, data: AssetData, asset_type: str):
         """Generic TwelveData fetcher."""
         try:
-            if not self.config.TWELVEDATA_API_KEY or self.config.TWELVEDATA_API_KEY == 'demo':
-                self.logger.warning("TwelveData API key not available")
+            if not Config.TWELVEDATA_API_KEY or Config.TWELVEDATA_API_KEY == 'demo':
+                logger.warning("TwelveData API key not available")
                 return
             
-            td_symbol = self.config.get_symbol_for_api(symbol, 'twelvedata')
-            url = self.config.API_ENDPOINTS['twelvedata']
-            params = {
-                'symbol': td_symbol,
-                'interval': '15min',
-                'outputsize': 50,
-                'apikey': self.config.TWELVEDATA_API_KEY
-            }
+            series = None
+            stored = self._bar_store.get(symbol)
             
-            async with self.session.get(url, params=params) as response:
-                if response.status == 200:
-                    td_data = await response.json()
-                    
-                    if 'values' in td_data and td_data['values']:
-                        values = td_data['values']
-                        
-                        prices = []
-                        volumes = []
-                        
-                        for item in reversed(values):  # Reverse to get chronological order
-                            prices.append(float(item['close']))
-                            volumes.append(float(item.get('volume', 0)))
-                        
-                        data['price_data'].extend(prices)
-                        data['volume_data'].extend(volumes)
-                        
-                        if prices:
-                            data['current_price'] = prices[-1]
-                        
-                        data['sources'].append(f'twelvedata_{asset_type}')
+            if stored:
+                # Request only the bars closed since the last fetch, plus the
+                # newest stored bar (which may have been still forming) as overlap
+                elapsed_bars = int((time.time() - stored.fetched_at) // (15 * 60))
+                tail_size = elapsed_bars + 2
+                if tail_size < self.TWELVEDATA_BARS:
+                    values = await self._get_twelvedata_values(symbol, 'twelvedata_tail', tail_size)
+                    if values:
+                        series = self._merge_bars(stored, values)
+            
+            if series is None:
+                values = await self._get_twelvedata_values(symbol, 'twelvedata', self.TWELVEDATA_BARS)
+                if values:
+                    series = BarSeries(
+                        [item['datetime'] for item in values],
+                        [float(item['close']) for item in values],
+                        [float(item.get('volume', 0)) for item in values],
+                        time.time()
+                    )
+            
+            if series is not None:
+                self._bar_store[symbol] = series
+                self._record_source(data, 'twelvedata', list(series.prices), list(series.volumes), series.prices[-1])
+                data.sources.append(f'twelvedata_{asset_type}')
                         
         except Exception as e:
-            self.logger.error(f"TwelveData API error for {symbol}: {str(e)}")
-            raise
+            logger.error(f"TwelveData API error for {symbol}: {str(e)}")
+    
+    async def _get_twelvedata_values(self, symbol: str, provider: str, outputsize: int) -> List[Dict]:
+        """
+        Fetch the newest TwelveData bars for a symbol.
+        
+        Args:
+            symbol: Trading symbol
+            provider: Cache key tag (full and tail requests are cached separately)
+            outputsize: Number of bars to request
+            
+        Returns:
+            Bars in chronological order (empty if the request failed)
+        """
+        url = Config.API_ENDPOINTS['twelvedata']
+        params = {
+            'symbol': Config.get_symbol_for_api(symbol, 'twelvedata'),
+            'interval': '15min',
+            'outputsize': outputsize,
+            'apikey': Config.TWELVEDATA_API_KEY
+        }
+        
+        td_data = await self._get_json(provider, symbol, url, params, bar_seconds=15 * 60, series_key='values')
+        if td_data is None or not td_data.get('values'):
+            return []
+        
+        return td_data['values'][::-1]  # Reverse to get chronological order
+    
+    def _merge_bars(self, stored: BarSeries, values: List[Dict]) -> Optional[BarSeries]:
+        """
+        Append newly fetched bars to a stored series.
+        
+        Stored bars from the first new bar onwards are replaced, so a bar that
+        was still forming at the last fetch gets its final close.
+        
+        Args:
+            stored: Series from the previous fetch
+            values: Newest bars in chronological order
+            
+        Returns:
+            Merged series trimmed to TWELVEDATA_BARS, or None if the new bars
+            do not overlap the stored ones (a full fetch is needed)
+        """
+        first = values[0]['datetime']
+        if not stored.timestamps or first > stored.timestamps[-1] or values[-1]['datetime'] < stored.timestamps[-1]:
+            return None
+        
+        keep = bisect.bisect_left(stored.timestamps, first)
+        limit = self.TWELVEDATA_BARS
+        
+        return BarSeries(
+            (stored.timestamps[:keep] + [item['datetime'] for item in values])[-limit:],
+            (stored.prices[:keep] + [float(item['close']) for item in values])[-limit:],
+            (stored.volumes[:keep] + [float(item.get('volume', 0)) for item in values])[-limit:],
+            time.time()
+        )
+    
+    def export_state(self) -> Dict:
+        """
+        Get the stored bar series, for saving across restarts.
+        
+        Returns:
+            Dict with the TwelveData bar series keyed by symbol
+        """
+        return {'bars': dict(self._bar_store)}
+    
+    def import_state(self, state: Dict):
+        """
+        Restore bar series saved by export_state().
+        
+        Series older than TWELVEDATA_BARS bars are refetched in full as usual.
+        
+        Args:
+            state: Result of export_state() from a previous run
+        """
+        self._bar_store.update(state['bars'])
     
     async def close(self):
-        """Close the aiohttp session."""
-        if self.session:
-            await self.session.close()
+        """Drop the session reference (the shared session is closed by its owner, not here)."""
+        if not self._external_session:
+            self.session = None
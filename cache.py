@@ -0,0 +1,93 @@
+"""
+On-disk cache for API responses.
+Stores raw response bodies under MD5-hashed filenames so bar series survive
+restarts and are only re-downloaded once a new bar has closed.
+"""
+
+import hashlib
+import logging
+import os
+import time
+from typing import Optional
+
+logger = logging.getLogger(__name__)
+
+class FileCache:
+    """TTL cache of raw bytes stored as one file per key."""
+    
+    def __init__(self, directory: str, ttl: float):
+        """
+        Initialize the file cache.
+        
+        Args:
+            directory: Directory holding the cache files (created on first write)
+            ttl: Seconds a cached entry stays valid
+        """
+        self.directory = directory
+        self.ttl = ttl
+        self.hits = 0
+        self.misses = 0
+    
+    def _path(self, key: str) -> str:
+        """Get the file path for a cache key."""
+        digest = hashlib.md5(key.encode('utf-8')).hexdigest()
+        return os.path.join(self.directory, f"{digest}.json")
+    
+    def get(self, key: str) -> Optional[bytes]:
+        """
+        Get a cached value.
+        
+        Args:
+            key: Cache key
+            
+        Returns:
+            Cached bytes, or None if missing or expired
+        """
+        path = self._path(key)
+        try:
+            if os.path.getmtime(path) + self.ttl > time.time():
+                with open(path, 'rb') as f:
+                    value = f.read()
+                self.hits += 1
+                logger.debug("File cache HIT | %s | hits=%d misses=%d", key, self.hits, self.misses)
+                return value
+        except OSError:
+            pass
+        
+        self.misses += 1
+        logger.debug("File cache MISS | %s | hits=%d misses=%d", key, self.hits, self.misses)
+        return None
+    
+    def set(self, key: str, value: bytes):
+        """
+        Store a value and drop expired entries.
+        
+        Args:
+            key: Cache key
+            value: Bytes to store
+        """
+        try:
+            os.makedirs(self.directory, exist_ok=True)
+            path = self._path(key)
+            temp_path = f"{path}.tmp"
+            
+            # Write then rename so readers never see a partial file
+            with open(temp_path, 'wb') as f:
+                f.write(value)
+            os.replace(temp_path, path)
+            
+            self._prune()
+        
+        except OSError as e:
+            logger.warning("Could not write file cache entry %s: %s", key, e)
+    
+    def _prune(self):
+        """Remove expired cache files."""
+        cutoff = time.time() - self.ttl
+        with os.scandir(self.directory) as entries:
+            for entry in entries:
+                try:
+                    if entry.is_file() and entry.stat().st_mtime < cutoff:
+                        os.remove(entry.path)
+                except OSError:
+                    continue
@@ -4,7 +4,7 @@ Contains all constants and configuration parameters.
 """
 
 import os
-from typing import List
+from typing import Dict, FrozenSet, List, Tuple
 
 class Config:
     """Configuration class containing all bot settings."""
@@ -18,6 +18,11 @@ class Config:
         'XRP/USD'
     ]
     
+    # Symbol groups by asset type
+    CRYPTO_SYMBOLS: FrozenSet[str] = frozenset({'BTC/USD', 'ETH/USD', 'XRP/USD'})
+    FOREX_SYMBOLS: FrozenSet[str] = frozenset({'EUR/USD'})
+    COMMODITY_SYMBOLS: FrozenSet[str] = frozenset({'XAU/USD'})
+    
     # API Keys (from environment variables with fallbacks)
     COINGECKO_API_KEY = os.getenv('COINGECKO_API_KEY', '')
     ALPHA_VANTAGE_API_KEY = os.getenv('ALPHA_VANTAGE_API_KEY', 'demo')
@@ -37,6 +42,9 @@ class Config:
     MA_SHORT_PERIOD = 50
     MA_LONG_PERIOD = 200
     
+    # Scheduling
+    ANALYSIS_INTERVAL_MINUTES = 10
+    
     # Signal Processing Parameters
     CONFIDENCE_THRESHOLD = 80  # Minimum confidence for sending alerts
     
@@ -44,6 +52,12 @@ class Config:
     API_TIMEOUT = 30  # seconds
     API_RETRY_ATTEMPTS = 3
     API_RETRY_DELAY = 5  # seconds
+    API_CACHE_TTL = 300  # seconds to reuse a provider response
+    OHLCV_CACHE_DIR = '.cache/ohlcv'  # on-disk copies of bar series responses
+    OHLCV_CACHE_TTL = 60 * 60  # longest bar interval in use (hourly)
+    FAILURE_BACKOFF_MIN = 60  # seconds to skip a provider after its first failure
+    FAILURE_BACKOFF_MAX = 60 * 60  # cap for the doubling backoff
+    STATE_FILE = '.cache/state.pkl'  # indicator and bar state kept across restarts
     
     # Logging Configuration
     LOG_LEVEL = 'INFO'
@@ -83,6 +97,16 @@ class Config:
         }
     }
     
+    # Flattened (symbol, api) -> API symbol lookup built from SYMBOL_MAPPING
+    API_SYMBOLS: Dict[Tuple[str, str], str] = {
+        (symbol, api): api_symbol
+        for symbol, apis in SYMBOL_MAPPING.items()
+        for api, api_symbol in apis.items()
+    }
+    
+    # Preferred data providers, best first; the first with a price series is used
+    SOURCE_PRIORITY: List[str] = ['twelvedata', 'coingecko', 'alpha_vantage']
+    
     # API Endpoints
     API_ENDPOINTS = {
         'coingecko_price': 'https://api.coingecko.com/api/v3/simple/price',
@@ -105,22 +129,22 @@ class Config:
         Returns:
             Symbol in API-specific format
         """
-        return cls.SYMBOL_MAPPING.get(symbol, {}).get(api, symbol)
+        return cls.API_SYMBOLS.get((symbol, api), symbol)
     
     @classmethod
     def is_crypto_symbol(cls, symbol: str) -> bool:
         """Check if symbol is a cryptocurrency."""
-        crypto_symbols = ['BTC/USD', 'ETH/USD', 'XRP/USD']
-        return symbol in crypto_symbols
+        return symbol in cls.CRYPTO_SYMBOLS
     
     @classmethod
     def is_forex_symbol(cls, symbol: str) -> bool:
         """Check if symbol is a forex pair."""
-        forex_symbols = ['EUR/USD']
-        return symbol in forex_symbols
+        return symbol in cls.FOREX_SYMBOLS
     
     @classmethod
     def is_commodity_symbol(cls, symbol: str) -> bool:
         """Check if symbol is a commodity."""
-        commodity_symbols = ['XAU/USD']
-        return symbol in commodity_symbols
+        return symbol in cls.COMMODITY_SYMBOLS
+
+# Shared settings instance; import this instead of constructing Config() per object
+CONFIG = Config()
@@ -4,261 +4,612 @@ Implements RSI, MACD, Bollinger Bands, Moving Averages, and Volume analysis.
 """
 
 import numpy as np
-import pandas as pd
-from typing import Dict, List, Optional
+from numpy.lib.stride_tricks import sliding_window_view
+from dataclasses import dataclass
+from typing import Dict, List, Optional, Tuple
 import logging
-from config import Config
+from config import CONFIG
+
+try:
+    from numba import njit
+except ImportError:  # numba is optional, kernels run as plain Python
+    def njit(*args, **kwargs):
+        if len(args) == 1 and callable(args[0]) and not kwargs:
+            return args[0]
+        return lambda func: func
+
+# Indicator periods, read once at import instead of on every call
+_RSI_PERIOD = int(CONFIG.RSI_PERIOD)
+_MACD_FAST = int(CONFIG.MACD_FAST_PERIOD)
+_MACD_SLOW = int(CONFIG.MACD_SLOW_PERIOD)
+_MACD_SIGNAL = int(CONFIG.MACD_SIGNAL_PERIOD)
+_BOLLINGER_PERIOD = int(CONFIG.BOLLINGER_PERIOD)
+_BOLLINGER_STD_DEV = float(CONFIG.BOLLINGER_STD_DEV)
+_MA_SHORT = int(CONFIG.MA_SHORT_PERIOD)
+_MA_LONG = int(CONFIG.MA_LONG_PERIOD)
+
+# Bars the windowed indicators need: the long MA plus the 5 points of
+# its slope, or the RSI period plus the 20-value RSI series
+_LOOKBACK = max(_MA_LONG + 5, _RSI_PERIOD + 21)
+
+# Saved state is only valid for the periods it was calculated with
+_STATE_PERIODS = (_RSI_PERIOD, _MACD_FAST, _MACD_SLOW, _MACD_SIGNAL, _BOLLINGER_PERIOD,
+                  _BOLLINGER_STD_DEV, _MA_SHORT, _MA_LONG)
+
+def _rolling_mean(values: np.ndarray, window: int) -> np.ndarray:
+    """
+    Rolling mean along the last axis via a cumulative-sum difference.
+    
+    Args:
+        values: Input array, one series per row
+        window: Window length
+        
+    Returns:
+        Array the same shape as values, NaN until the first full window
+    """
+    n = values.shape[-1]
+    result = np.full(values.shape, np.nan)
+    if n >= window:
+        cs = np.zeros(values.shape[:-1] + (n + 1,))
+        np.cumsum(values, axis=-1, out=cs[..., 1:])
+        result[..., window - 1:] = (cs[..., window:] - cs[..., :-window]) / window
+    return result
+
+def _prefix_sums(values: np.ndarray, out: Optional[np.ndarray] = None) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Centred prefix sums of values along the last axis.
+    
+    Computed once per price block and shared by both moving averages, so the
+    series is scanned once instead of once per average. Each series is
+    centred on its mean first so window differences do not lose precision
+    for large prices.
+    
+    Args:
+        values: Input array, one series per row
+        out: Optional scratch buffer of shape (*values.shape[:-1], n + 1)
+            to write the sums into
+        
+    Returns:
+        Tuple of (prefix sums, centring offsets)
+    """
+    if out is None:
+        out = np.empty(values.shape[:-1] + (values.shape[-1] + 1,))
+    
+    offset = values.mean(axis=-1, keepdims=True)
+    out[..., 0] = 0.0
+    np.cumsum(values - offset, axis=-1, out=out[..., 1:])
+    return out, offset
+
+def _windowed_mean(prefix: Tuple[np.ndarray, np.ndarray], window: int) -> np.ndarray:
+    """
+    Rolling mean from prefix sums.
+    
+    Args:
+        prefix: Result of _prefix_sums()
+        window: Window length
+        
+    Returns:
+        Array the same shape as the input values, NaN until the first full window
+    """
+    cs, offset = prefix
+    result = np.full(cs.shape[:-1] + (cs.shape[-1] - 1,), np.nan)
+    if cs.shape[-1] > window:
+        result[..., window - 1:] = (cs[..., window:] - cs[..., :-window]) / window + offset
+    return result
+
+def _fill_nan(values: List, defaults) -> List:
+    """
+    Replace NaN entries with defaults in a single vectorized step.
+    
+    Args:
+        values: Indicator outputs, one scalar or one per-symbol array per field
+        defaults: Default for each field (scalar or one per field)
+        
+    Returns:
+        List with one float (or one list of per-symbol floats) per field
+    """
+    values = np.asarray(values, dtype=np.float64)
+    defaults = np.asarray(defaults, dtype=np.float64)
+    if values.ndim > 1 and defaults.ndim:
+        defaults = defaults[:, np.newaxis]
+    return np.where(np.isnan(values), defaults, values).tolist()
+
+def _row_slopes(block: np.ndarray) -> np.ndarray:
+    """
+    Least-squares slope of every row of a 2-D block.
+    
+    Args:
+        block: Array of shape (rows, points)
+        
+    Returns:
+        Array of per-row slopes (zeros when there are fewer than 2 points)
+    """
+    if block.shape[-1] < 2:
+        return np.zeros(block.shape[0])
+    return block @ _slope_weights(block.shape[-1])
+
+def _slope_weights(n: int) -> np.ndarray:
+    """
+    Weights w such that w @ y is the least-squares slope of y against 0..n-1.
+    
+    With x = 0..n-1 the OLS slope reduces to sum((x - mean_x) * y) / sum((x - mean_x)**2),
+    so the weights depend only on n and are cached.
+    
+    Args:
+        n: Number of points
+        
+    Returns:
+        Weight array of length n
+    """
+    weights = _SLOPE_WEIGHTS.get(n)
+    if weights is None:
+        centred = np.arange(n, dtype=np.float64) - (n - 1) / 2
+        weights = centred / np.dot(centred, centred)
+        _SLOPE_WEIGHTS[n] = weights
+    return weights
+
+# Slope weights for the common 5-point (MA) and 10-point (volume) windows
+_SLOPE_WEIGHTS: Dict[int, np.ndarray] = {}
+_slope_weights(5)
+_slope_weights(10)
+
+# Layout of the MACD running state array passed to _macd_kernel
+_MACD_STATE_SIZE = 8  # fast sum/total, slow sum/total, signal sum/total, last macd, last signal
+
+def _new_macd_state() -> np.ndarray:
+    """Create an empty MACD running state (no bars seen yet)."""
+    state = np.zeros(_MACD_STATE_SIZE)
+    state[6:] = np.nan
+    return state
+
+@njit('UniTuple(float64, 4)(float64[::1], int64, int64, int64, float64[::1])', cache=True)
+def _macd_kernel(values, fast_span, slow_span, signal_span, state):
+    """
+    Advance the fast, slow and signal EMAs for MACD over new bars in a single pass.
+    
+    Each EMA matches pandas ewm(span=...).mean() (adjust=True), kept as a
+    running weighted sum and weight total. The running state is read from and
+    written back to `state`, so later calls can continue from where this one
+    stopped when bars are appended.
+    
+    Args:
+        values: New price bars (the full history on the first call)
+        fast_span: Fast EMA span
+        slow_span: Slow EMA span
+        signal_span: Signal line EMA span
+        state: Running state array from _new_macd_state(), updated in place
+        
+    Returns:
+        Tuple of (macd, signal, macd_prev, signal_prev) for the last two bars
+    """
+    fast_decay = 1.0 - 2.0 / (fast_span + 1)
+    slow_decay = 1.0 - 2.0 / (slow_span + 1)
+    signal_decay = 1.0 - 2.0 / (signal_span + 1)
+    
+    fast_sum, fast_total = state[0], state[1]
+    slow_sum, slow_total = state[2], state[3]
+    signal_sum, signal_total = state[4], state[5]
+    macd, signal = state[6], state[7]
+    macd_prev = signal_prev = np.nan
+    
+    for i in range(values.shape[0]):
+        value = values[i]
+        fast_sum = value + fast_decay * fast_sum
+        fast_total = 1.0 + fast_decay * fast_total
+        slow_sum = value + slow_decay * slow_sum
+        slow_total = 1.0 + slow_decay * slow_total
+        
+        macd_prev = macd
+        signal_prev = signal
+        macd = fast_sum / fast_total - slow_sum / slow_total
+        
+        signal_sum = macd + signal_decay * signal_sum
+        signal_total = 1.0 + signal_decay * signal_total
+        signal = signal_sum / signal_total
+    
+    state[0], state[1] = fast_sum, fast_total
+    state[2], state[3] = slow_sum, slow_total
+    state[4], state[5] = signal_sum, signal_total
+    state[6], state[7] = macd, signal
+    
+    return macd, signal, macd_prev, signal_prev
+
+def _calculate_rsi(prices: np.ndarray) -> List[Dict]:
+    """
+    Calculate Relative Strength Index (RSI).
+    
+    Args:
+        prices: Price block of shape (symbols, bars)
+        
+    Returns:
+        List with a dict of RSI values per symbol
+    """
+    delta = np.diff(prices, axis=-1)
+    gain = _rolling_mean(np.maximum(delta, 0.0), _RSI_PERIOD)
+    loss = _rolling_mean(-np.minimum(delta, 0.0), _RSI_PERIOD)
+    
+    with np.errstate(divide='ignore', invalid='ignore'):
+        rs = gain / loss
+        rsi = 100 - (100 / (1 + rs))
+    
+    current, previous = _fill_nan([rsi[:, -1], rsi[:, -2]], 50.0)
+    
+    return [
+        {
+            'current': current[row],
+            'previous': previous[row],
+            'series': series[~np.isnan(series)][-20:].tolist()  # Last 20 values
+        }
+        for row, series in enumerate(rsi)
+    ]
+
+def _calculate_macd(prices: np.ndarray, state: np.ndarray) -> Dict:
+    """
+    Calculate MACD (Moving Average Convergence Divergence).
+    
+    Args:
+        prices: Price bars not yet folded into state
+        state: MACD running state, advanced in place
+        
+    Returns:
+        Dict with MACD values
+    """
+    # MACD line, signal line (EMA of MACD) and their previous values
+    macd_line, signal_line, macd_prev, signal_prev = _macd_kernel(
+        prices,
+        _MACD_FAST,
+        _MACD_SLOW,
+        _MACD_SIGNAL,
+        state
+    )
+    
+    # Histogram
+    histogram = macd_line - signal_line
+    
+    macd_line, signal_line, histogram, macd_prev, signal_prev = _fill_nan(
+        [macd_line, signal_line, histogram, macd_prev, signal_prev], 0.0
+    )
+    
+    return {
+        'macd': macd_line,
+        'signal': signal_line,
+        'histogram': histogram,
+        'macd_prev': macd_prev,
+        'signal_prev': signal_prev
+    }
+
+def _calculate_bollinger_bands(prices: np.ndarray) -> List[Dict]:
+    """
+    Calculate Bollinger Bands.
+    
+    Args:
+        prices: Price block of shape (symbols, bars)
+        
+    Returns:
+        List with a dict of Bollinger Bands values per symbol
+    """
+    # Only the latest bar is reported, so only the last window is needed
+    if prices.shape[-1] >= _BOLLINGER_PERIOD:
+        window = prices[:, -_BOLLINGER_PERIOD:]
+        sma = window.mean(axis=-1)
+        std = window.std(axis=-1, ddof=1)
+    else:
+        sma = std = np.full(prices.shape[0], np.nan)
+    price = prices[:, -1]
+    
+    # Bollinger Bands
+    upper_band = sma + (std * _BOLLINGER_STD_DEV)
+    lower_band = sma - (std * _BOLLINGER_STD_DEV)
+    
+    # Band width and %B
+    with np.errstate(divide='ignore', invalid='ignore'):
+        band_width = (upper_band - lower_band) / sma * 100
+        percent_b = (price - lower_band) / (upper_band - lower_band) * 100
+    
+    upper, middle, lower, width, pct_b = _fill_nan(
+        [upper_band, sma, lower_band, band_width, percent_b],
+        [0.0, 0.0, 0.0, 0.0, 50.0]
+    )
+    
+    return [
+        {
+            'upper': upper[row],
+            'middle': middle[row],
+            'lower': lower[row],
+            'width': width[row],
+            'percent_b': pct_b[row]
+        }
+        for row in range(len(upper))
+    ]
+
+def _calculate_moving_averages(prefix: Tuple[np.ndarray, np.ndarray]) -> List[Dict]:
+    """
+    Calculate Moving Averages (50 and 200 period).
+    
+    Args:
+        prefix: Prefix sums of prices from _prefix_sums()
+        
+    Returns:
+        List with a dict of moving average values per symbol
+    """
+    ma50 = _windowed_mean(prefix, _MA_SHORT)
+    ma200 = _windowed_mean(prefix, _MA_LONG)
+    
+    ma50_last, ma200_last, ma50_prev, ma200_prev = _fill_nan(
+        [ma50[:, -1], ma200[:, -1], ma50[:, -2], ma200[:, -2]], 0.0
+    )
+    
+    # Prices are finite, so each average is defined from its first full window on
+    ma50_slope = _row_slopes(ma50[:, _MA_SHORT - 1:][:, -5:]).tolist()
+    ma200_slope = _row_slopes(ma200[:, _MA_LONG - 1:][:, -5:]).tolist()
+    
+    return [
+        {
+            'ma50': ma50_last[row],
+            'ma200': ma200_last[row],
+            'ma50_prev': ma50_prev[row],
+            'ma200_prev': ma200_prev[row],
+            'ma50_slope': ma50_slope[row],
+            'ma200_slope': ma200_slope[row]
+        }
+        for row in range(len(ma50_last))
+    ]
+
+def _calculate_stochastic(prices: np.ndarray) -> List[Dict]:
+    """
+    Calculate Stochastic Oscillator.
+    
+    Args:
+        prices: Price block of shape (symbols, bars), assuming close prices
+        
+    Returns:
+        List with a dict of stochastic values per symbol
+    """
+    # For simplicity, using prices as both high, low, and close.
+    # %D is the 3-bar mean of %K, so only the last 3 14-bar windows are needed
+    windows = sliding_window_view(prices[:, -16:], 14, axis=-1)
+    high = windows.max(axis=-1)
+    low = windows.min(axis=-1)
+    
+    with np.errstate(divide='ignore', invalid='ignore'):
+        k_percent = ((prices[:, -3:] - low) / (high - low)) * 100
+    d_percent = k_percent.mean(axis=-1)
+    
+    k, d = _fill_nan([k_percent[:, -1], d_percent], 50.0)
+    
+    return [{'k': k[row], 'd': d[row]} for row in range(len(k))]
+
+def _calculate_momentum(prices: np.ndarray) -> List[Dict]:
+    """
+    Calculate price momentum.
+    
+    Args:
+        prices: Price block of shape (symbols, bars)
+        
+    Returns:
+        List with a dict of momentum values per symbol
+    """
+    # Only the latest value is reported, so skip the full shifted series
+    with np.errstate(divide='ignore', invalid='ignore'):
+        momentum_10 = prices[:, -1] / prices[:, -11] - 1  # 10-period momentum
+        momentum_20 = prices[:, -1] / prices[:, -21] - 1  # 20-period momentum
+    
+    momentum_10, momentum_20 = _fill_nan([momentum_10, momentum_20], 0.0)
+    
+    return [
+        {
+            'momentum_10': momentum_10[row],
+            'momentum_20': momentum_20[row]
+        }
+        for row in range(len(momentum_10))
+    ]
+
+def _calculate_slope(series: np.ndarray) -> float:
+    """
+    Calculate the slope of a series (trend direction).
+    
+    Args:
+        series: Data series
+        
+    Returns:
+        Slope value
+    """
+    if len(series) < 2:
+        return 0
+    
+    y = np.asarray(series, dtype=np.float64)
+    
+    # Closed-form least-squares slope against x = 0..n-1
+    slope = np.dot(_slope_weights(len(y)), y)
+    return float(slope)
+
+@dataclass(slots=True)
+class IndicatorState:
+    """Per-symbol state kept between calculate_all_indicators calls."""
+    
+    prices: np.ndarray
+    macd_state: np.ndarray
+    indicators: Dict
 
 class TechnicalIndicators:
     """Calculate various technical indicators for trading signals."""
     
     def __init__(self):
-        self.config = Config()
+        self.config = CONFIG
         self.logger = logging.getLogger(__name__)
+        self._state: Dict[str, IndicatorState] = {}
+        
+        # Reused prefix-sum buffer, grown to the largest batch seen; the
+        # windowed indicators never see more than _LOOKBACK bars
+        self._prefix_scratch = np.empty((1, _LOOKBACK + 1))
     
-    def calculate_all_indicators(self, price_data: List[float]) -> Dict:
+    def calculate_all_indicators(self, price_data: List[float], symbol: Optional[str] = None) -> Dict:
         """
         Calculate all technical indicators for given price data.
         
+        When a symbol is given, results are kept per symbol: an unchanged
+        history returns the previous indicators, and a history that only had
+        bars appended advances the MACD EMAs over the new bars instead of
+        replaying the whole series. The windowed indicators only ever look at
+        the most recent bars they need.
+        
         Args:
             price_data: List of price values (chronological order)
+            symbol: Trading symbol used to key the incremental state
             
         Returns:
             Dict containing all calculated indicators
         """
-        if not price_data or len(price_data) < 50:
-            self.logger.warning("Insufficient price data for technical analysis")
-            return {}
-        
-        try:
-            # Convert to pandas Series for easier calculation
-            prices = pd.Series(price_data)
-            
-            indicators = {}
-            
-            # Calculate RSI
-            indicators['rsi'] = self._calculate_rsi(prices)
-            
-            # Calculate MACD
-            indicators['macd'] = self._calculate_macd(prices)
-            
-            # Calculate Bollinger Bands
-            indicators['bollinger'] = self._calculate_bollinger_bands(prices)
-            
-            # Calculate Moving Averages
-            indicators['ma'] = self._calculate_moving_averages(prices)
-            
-            # Calculate additional indicators
-            indicators['stochastic'] = self._calculate_stochastic(prices)
-            indicators['momentum'] = self._calculate_momentum(prices)
-            
-            return indicators
-            
-        except Exception as e:
-            self.logger.error(f"Error calculating indicators: {str(e)}")
-            return {}
+        return self._calculate_batch([(symbol, price_data)])[0]
     
-    def _calculate_rsi(self, prices: pd.Series) -> Dict:
+    def calculate_indicators_batch(self, price_histories: Dict[str, List[float]]) -> Dict[str, Dict]:
         """
-        Calculate Relative Strength Index (RSI).
+        Calculate all technical indicators for several symbols at once.
         
-        Args:
-            prices: Price series
-            
-        Returns:
-            Dict with RSI values
-        """
-        try:
-            delta = prices.diff()
-            gain = (delta.where(delta > 0, 0)).rolling(window=self.config.RSI_PERIOD).mean()
-            loss = (-delta.where(delta < 0, 0)).rolling(window=self.config.RSI_PERIOD).mean()
-            
-            rs = gain / loss
-            rsi = 100 - (100 / (1 + rs))
-            
-            return {
-                'current': float(rsi.iloc[-1]) if not np.isnan(rsi.iloc[-1]) else 50,
-                'previous': float(rsi.iloc[-2]) if len(rsi) > 1 and not np.isnan(rsi.iloc[-2]) else 50,
-                'series': rsi.dropna().tolist()[-20:]  # Last 20 values
-            }
-            
-        except Exception as e:
-            self.logger.error(f"Error calculating RSI: {str(e)}")
-            return {'current': 50, 'previous': 50, 'series': []}
-    
-    def _calculate_macd(self, prices: pd.Series) -> Dict:
-        """
-        Calculate MACD (Moving Average Convergence Divergence).
+        Symbols whose recent windows have the same length are stacked into one
+        (symbols, bars) block, so each windowed indicator runs once per block
+        instead of once per symbol. Per-symbol state is kept exactly as in
+        calculate_all_indicators.
         
         Args:
-            prices: Price series
+            price_histories: Price values (chronological order) keyed by symbol
             
         Returns:
-            Dict with MACD values
+            Dict of indicator dicts keyed by symbol (empty for unusable histories)
         """
-        try:
-            # Calculate EMAs
-            ema_fast = prices.ewm(span=self.config.MACD_FAST_PERIOD).mean()
-            ema_slow = prices.ewm(span=self.config.MACD_SLOW_PERIOD).mean()
-            
-            # MACD line
-            macd_line = ema_fast - ema_slow
-            
-            # Signal line (EMA of MACD)
-            signal_line = macd_line.ewm(span=self.config.MACD_SIGNAL_PERIOD).mean()
-            
-            # Histogram
-            histogram = macd_line - signal_line
-            
-            return {
-                'macd': float(macd_line.iloc[-1]) if not np.isnan(macd_line.iloc[-1]) else 0,
-                'signal': float(signal_line.iloc[-1]) if not np.isnan(signal_line.iloc[-1]) else 0,
-                'histogram': float(histogram.iloc[-1]) if not np.isnan(histogram.iloc[-1]) else 0,
-                'macd_prev': float(macd_line.iloc[-2]) if len(macd_line) > 1 and not np.isnan(macd_line.iloc[-2]) else 0,
-                'signal_prev': float(signal_line.iloc[-2]) if len(signal_line) > 1 and not np.isnan(signal_line.iloc[-2]) else 0
-            }
-            
-        except Exception as e:
-            self.logger.error(f"Error calculating MACD: {str(e)}")
-            return {'macd': 0, 'signal': 0, 'histogram': 0, 'macd_prev': 0, 'signal_prev': 0}
+        symbols = list(price_histories)
+        results = self._calculate_batch([(symbol, price_histories[symbol]) for symbol in symbols])
+        return dict(zip(symbols, results))
     
-    def _calculate_bollinger_bands(self, prices: pd.Series) -> Dict:
+    def _calculate_batch(self, histories: List[Tuple[Optional[str], List[float]]]) -> List[Dict]:
         """
-        Calculate Bollinger Bands.
+        Calculate indicators for (symbol, price_data) pairs.
         
         Args:
-            prices: Price series
+            histories: Symbol (or None for no state) and price values per entry
             
         Returns:
-            Dict with Bollinger Bands values
+            List of indicator dicts in the same order as histories
         """
-        try:
-            # Simple Moving Average
-            sma = prices.rolling(window=self.config.BOLLINGER_PERIOD).mean()
-            
-            # Standard Deviation
-            std = prices.rolling(window=self.config.BOLLINGER_PERIOD).std()
-            
-            # Bollinger Bands
-            upper_band = sma + (std * self.config.BOLLINGER_STD_DEV)
-            lower_band = sma - (std * self.config.BOLLINGER_STD_DEV)
-            
-            # Band width and %B
-            band_width = (upper_band - lower_band) / sma * 100
-            percent_b = (prices - lower_band) / (upper_band - lower_band) * 100
-            
-            return {
-                'upper': float(upper_band.iloc[-1]) if not np.isnan(upper_band.iloc[-1]) else 0,
-                'middle': float(sma.iloc[-1]) if not np.isnan(sma.iloc[-1]) else 0,
-                'lower': float(lower_band.iloc[-1]) if not np.isnan(lower_band.iloc[-1]) else 0,
-                'width': float(band_width.iloc[-1]) if not np.isnan(band_width.iloc[-1]) else 0,
-                'percent_b': float(percent_b.iloc[-1]) if not np.isnan(percent_b.iloc[-1]) else 50
-            }
-            
-        except Exception as e:
-            self.logger.error(f"Error calculating Bollinger Bands: {str(e)}")
-            return {'upper': 0, 'middle': 0, 'lower': 0, 'width': 0, 'percent_b': 50}
-    
-    def _calculate_moving_averages(self, prices: pd.Series) -> Dict:
-        """
-        Calculate Moving Averages (50 and 200 period).
+        results: List[Dict] = [{} for _ in histories]
         
-        Args:
-            prices: Price series
-            
-        Returns:
-            Dict with moving average values
-        """
-        try:
-            ma50 = prices.rolling(window=self.config.MA_SHORT_PERIOD).mean()
-            ma200 = prices.rolling(window=self.config.MA_LONG_PERIOD).mean()
-            
-            return {
-                'ma50': float(ma50.iloc[-1]) if not np.isnan(ma50.iloc[-1]) else 0,
-                'ma200': float(ma200.iloc[-1]) if not np.isnan(ma200.iloc[-1]) else 0,
-                'ma50_prev': float(ma50.iloc[-2]) if len(ma50) > 1 and not np.isnan(ma50.iloc[-2]) else 0,
-                'ma200_prev': float(ma200.iloc[-2]) if len(ma200) > 1 and not np.isnan(ma200.iloc[-2]) else 0,
-                'ma50_slope': self._calculate_slope(ma50.dropna().iloc[-5:]),
-                'ma200_slope': self._calculate_slope(ma200.dropna().iloc[-5:])
-            }
-            
-        except Exception as e:
-            self.logger.error(f"Error calculating moving averages: {str(e)}")
-            return {'ma50': 0, 'ma200': 0, 'ma50_prev': 0, 'ma200_prev': 0, 'ma50_slope': 0, 'ma200_slope': 0}
+        # Pending entries grouped by the length of their recent window:
+        # (result index, symbol, prices, MACD state, MACD result)
+        groups: Dict[int, List[Tuple[int, Optional[str], np.ndarray, np.ndarray, Dict]]] = {}
+        
+        for index, (symbol, price_data) in enumerate(histories):
+            if price_data is None or len(price_data) < 50:
+                self.logger.warning("Insufficient price data for technical analysis")
+                continue
+            
+            try:
+                # Convert once to a contiguous float array shared by every
+                # indicator; the compiled MACD kernel only accepts C layout
+                prices = np.ascontiguousarray(price_data, dtype=np.float64)
+                
+                # Validate once here; the individual indicators assume finite prices
+                if not np.isfinite(prices).all():
+                    self.logger.warning("Non-finite prices in data, skipping technical analysis")
+                    continue
+                
+                state = self._state.get(symbol) if symbol else None
+                previous_len = len(state.prices) if state else 0
+                
+                if state and np.array_equal(prices, state.prices):
+                    results[index] = state.indicators
+                    continue
+                
+                if state and len(prices) > previous_len and np.array_equal(prices[:previous_len], state.prices):
+                    # Only new bars were appended: continue the EMAs from the saved state
+                    macd_state = state.macd_state.copy()
+                    macd_input = prices[previous_len:]
+                else:
+                    macd_state = _new_macd_state()
+                    macd_input = prices
+                
+                # MACD is sequential per symbol, so it runs outside the block
+                macd = _calculate_macd(macd_input, macd_state)
+                
+                window = min(len(prices), _LOOKBACK)
+                groups.setdefault(window, []).append((index, symbol, prices, macd_state, macd))
+                
+            except Exception as e:
+                self.logger.error("Error calculating indicators: %s", e)
+        
+        for window, members in groups.items():
+            try:
+                block = np.stack([prices[-window:] for _, _, prices, _, _ in members])
+                prefix = _prefix_sums(block, self._prefix_buffer(len(members), window))
+                
+                columns = zip(
+                    _calculate_rsi(block),
+                    _calculate_bollinger_bands(block),
+                    _calculate_moving_averages(prefix),
+                    _calculate_stochastic(block),
+                    _calculate_momentum(block)
+                )
+                
+                for (index, symbol, prices, macd_state, macd), (rsi, bollinger, ma, stochastic, momentum) in zip(members, columns):
+                    indicators = {
+                        'rsi': rsi,
+                        'macd': macd,
+                        'bollinger': bollinger,
+                        'ma': ma,
+                        'stochastic': stochastic,
+                        'momentum': momentum
+                    }
+                    results[index] = indicators
+                    
+                    if symbol:
+                        self._state[symbol] = IndicatorState(prices, macd_state, indicators)
+                
+            except Exception as e:
+                self.logger.error("Error calculating indicators: %s", e)
+        
+        return results
     
-    def _calculate_stochastic(self, prices: pd.Series) -> Dict:
+    def _prefix_buffer(self, rows: int, bars: int) -> np.ndarray:
         """
-        Calculate Stochastic Oscillator.
+        Get a (rows, bars + 1) view of the reusable prefix-sum buffer.
         
         Args:
-            prices: Price series (assuming close prices)
+            rows: Number of symbols in the block
+            bars: Bars per symbol
             
         Returns:
-            Dict with stochastic values
+            Scratch view for _prefix_sums()
         """
-        try:
-            # For simplicity, using prices as both high, low, and close
-            high = prices.rolling(window=14).max()
-            low = prices.rolling(window=14).min()
-            
-            k_percent = ((prices - low) / (high - low)) * 100
-            d_percent = k_percent.rolling(window=3).mean()
-            
-            return {
-                'k': float(k_percent.iloc[-1]) if not np.isnan(k_percent.iloc[-1]) else 50,
-                'd': float(d_percent.iloc[-1]) if not np.isnan(d_percent.iloc[-1]) else 50
-            }
-            
-        except Exception as e:
-            self.logger.error(f"Error calculating stochastic: {str(e)}")
-            return {'k': 50, 'd': 50}
+        if self._prefix_scratch.shape[0] < rows:
+            self._prefix_scratch = np.empty((rows, _LOOKBACK + 1))
+        return self._prefix_scratch[:rows, :bars + 1]
     
-    def _calculate_momentum(self, prices: pd.Series) -> Dict:
+    def export_state(self) -> Dict:
         """
-        Calculate price momentum.
+        Get the per-symbol state kept between calls, for saving across restarts.
         
-        Args:
-            prices: Price series
-            
         Returns:
-            Dict with momentum values
+            Dict with the indicator state keyed by symbol
         """
-        try:
-            momentum_10 = prices / prices.shift(10) - 1  # 10-period momentum
-            momentum_20 = prices / prices.shift(20) - 1  # 20-period momentum
-            
-            return {
-                'momentum_10': float(momentum_10.iloc[-1]) if not np.isnan(momentum_10.iloc[-1]) else 0,
-                'momentum_20': float(momentum_20.iloc[-1]) if not np.isnan(momentum_20.iloc[-1]) else 0
-            }
-            
-        except Exception as e:
-            self.logger.error(f"Error calculating momentum: {str(e)}")
-            return {'momentum_10': 0, 'momentum_20': 0}
+        return {
+            'periods': _STATE_PERIODS,
+            'indicators': dict(self._state)
+        }
     
-    def _calculate_slope(self, series: pd.Series) -> float:
+    def import_state(self, state: Dict) -> bool:
         """
-        Calculate the slope of a series (trend direction).
+        Restore per-symbol state saved by export_state().
         
         Args:
-            series: Data series
+            state: Result of export_state() from a previous run
             
         Returns:
-            Slope value
+            True if the state was restored, False if it was calculated with different periods
         """
-        try:
-            if len(series) < 2:
-                return 0
-            
-            x = np.arange(len(series))
-            y = series.values
-            
-            # Linear regression slope
-            slope = np.polyfit(x, y, 1)[0]
-            return float(slope)
-            
-        except Exception as e:
-            return 0
+        if state.get('periods') != _STATE_PERIODS:
+            return False
+        
+        self._state.update(state['indicators'])
+        return True
     
     def calculate_volume_indicators(self, price_data: List[float], volume_data: List[float]) -> Dict:
         """
@@ -272,31 +623,48 @@ class TechnicalIndicators:
             Dict with volume indicators
         """
         try:
-            if not volume_data or len(volume_data) < 20:
+            if volume_data is None or len(volume_data) < 20:
                 return {'volume_sma': 0, 'volume_ratio': 1, 'vwap': 0}
             
-            volumes = pd.Series(volume_data)
-            prices = pd.Series(price_data)
+            volumes = np.asarray(volume_data, dtype=np.float64)
+            prices = np.asarray(price_data, dtype=np.float64)
             
-            # Volume Simple Moving Average
-            volume_sma = volumes.rolling(window=20).mean()
+            # Volume Simple Moving Average (only the latest window is used)
+            avg_volume = volumes[-20:].mean()
             
             # Current volume vs average ratio
-            current_volume = volumes.iloc[-1]
-            avg_volume = volume_sma.iloc[-1]
+            current_volume = volumes[-1]
             volume_ratio = current_volume / avg_volume if avg_volume > 0 else 1
             
             # Volume Weighted Average Price (approximation)
-            typical_price = prices  # Using close price as typical price
-            vwap = (typical_price * volumes).sum() / volumes.sum() if volumes.sum() > 0 else 0
+            vwap = self._calculate_vwap(prices, volumes)
+            
+            avg_volume, vwap = _fill_nan([avg_volume, vwap], 0.0)
             
             return {
-                'volume_sma': float(avg_volume) if not np.isnan(avg_volume) else 0,
+                'volume_sma': avg_volume,
                 'volume_ratio': float(volume_ratio),
-                'vwap': float(vwap) if not np.isnan(vwap) else 0,
-                'volume_trend': self._calculate_slope(volumes.iloc[-10:])
+                'vwap': vwap,
+                'volume_trend': _calculate_slope(volumes[-10:])
             }
             
         except Exception as e:
-            self.logger.error(f"Error calculating volume indicators: {str(e)}")
+            self.logger.error("Error calculating volume indicators: %s", e)
             return {'volume_sma': 0, 'volume_ratio': 1, 'vwap': 0, 'volume_trend': 0}
+    
+    def _calculate_vwap(self, prices: np.ndarray, volumes: np.ndarray) -> float:
+        """
+        Calculate VWAP, pairing price and volume bars by position.
+        
+        Args:
+            prices: Price series (close price used as typical price)
+            volumes: Volume series
+            
+        Returns:
+            VWAP value (0 when there is no volume)
+        """
+        paired = min(len(prices), len(volumes))
+        sum_pv = np.dot(prices[:paired], volumes[:paired])
+        sum_v = volumes.sum()
+        
+        return sum_pv / sum_v if sum_v > 0 else 0
@@ -3,11 +3,109 @@ Logging configuration for the Trading Signal Bot.
 Sets up structured logging with file rotation and console output.
 """
 
+import atexit
+import json
 import logging
 import logging.handlers
 import os
+import queue
+import threading
+from collections import Counter
 from datetime import datetime
-from config import Config
+from config import CONFIG
+
+try:
+    import orjson
+except ImportError:  # orjson is optional, fall back to stdlib
+    orjson = None
+
+# Decoder for log lines; both accept bytes and raise ValueError subclasses
+_loads = orjson.loads if orjson is not None else json.loads
+
+class _JsonLineFormatter(logging.Formatter):
+    """Formatter that emits the record's structured payload as one compact JSON line."""
+    
+    def format(self, record: logging.LogRecord) -> str:
+        if orjson is not None:
+            return orjson.dumps(
+                record.log_data,
+                default=str,
+                option=orjson.OPT_SERIALIZE_NUMPY | orjson.OPT_NON_STR_KEYS
+            ).decode('utf-8')
+        return json.dumps(record.log_data, separators=(',', ':'), default=str)
+
+class _WatchedRotatingFileHandler(logging.handlers.RotatingFileHandler):
+    """Size-rotated file handler that also reopens its file when it is replaced."""
+    
+    def _open(self):
+        stream = super()._open()
+        stat = os.fstat(stream.fileno())
+        self._identity = (stat.st_dev, stat.st_ino)
+        return stream
+    
+    def emit(self, record: logging.LogRecord):
+        # Like WatchedFileHandler: cleanup_old_logs swaps in a new file
+        if self.stream is not None:
+            try:
+                stat = os.stat(self.baseFilename)
+                replaced = (stat.st_dev, stat.st_ino) != self._identity
+            except FileNotFoundError:
+                replaced = True
+            
+            if replaced:
+                self.stream.close()
+                self.stream = None
+        
+        super().emit(record)
+
+def _queue_handler_for(handler: logging.Handler) -> logging.handlers.QueueHandler:
+    """
+    Move a blocking handler onto a background QueueListener thread.
+    
+    Args:
+        handler: Handler that performs the actual (disk) I/O
+        
+    Returns:
+        QueueHandler that only enqueues records on the calling thread
+    """
+    log_queue = queue.SimpleQueue()
+    listener = logging.handlers.QueueListener(log_queue, handler, respect_handler_level=True)
+    listener.start()
+    atexit.register(listener.stop)
+    return logging.handlers.QueueHandler(log_queue)
+
+def _get_structured_logger(filename: str) -> logging.Logger:
+    """
+    Get a logger that appends one JSON line per record to filename.
+    
+    Args:
+        filename: JSON-lines log file
+        
+    Returns:
+        Logger whose file writes run on a background thread
+    """
+    logger = logging.getLogger(f"structured.{filename}")
+    if logger.handlers:
+        return logger
+    
+    # Ensure log directory exists
+    log_dir = os.path.dirname(filename) if os.path.dirname(filename) else '.'
+    os.makedirs(log_dir, exist_ok=True)
+    
+    # Bounded like the main log, and reopened after cleanup_old_logs replaces it
+    file_handler = _WatchedRotatingFileHandler(
+        filename,
+        maxBytes=CONFIG.MAX_LOG_SIZE,
+        backupCount=CONFIG.LOG_BACKUP_COUNT,
+        encoding='utf-8',
+        delay=True
+    )
+    file_handler.setFormatter(_JsonLineFormatter())
+    
+    logger.addHandler(_queue_handler_for(file_handler))
+    logger.setLevel(logging.INFO)
+    logger.propagate = False
+    return logger
 
 def setup_logger(name: str = None) -> logging.Logger:
     """
@@ -19,7 +117,7 @@ def setup_logger(name: str = None) -> logging.Logger:
     Returns:
         Configured logger instance
     """
-    config = Config()
+    config = CONFIG
     
     # Create logger
     logger = logging.getLogger(name)
@@ -50,7 +148,17 @@ def setup_logger(name: str = None) -> logging.Logger:
         )
         file_handler.setLevel(logging.DEBUG)
         file_handler.setFormatter(detailed_formatter)
-        logger.addHandler(file_handler)
+        
+        # Batch records on the listener side; flushed every 256 records,
+        # on any ERROR, and at shutdown
+        buffered_handler = logging.handlers.MemoryHandler(
+            capacity=256,
+            flushLevel=logging.ERROR,
+            target=file_handler
+        )
+        
+        # Disk writes happen on a listener thread, not in the trading loop
+        logger.addHandler(_queue_handler_for(buffered_handler))
     except Exception as e:
         print(f"Warning: Could not create file handler: {e}")
     
@@ -63,12 +171,216 @@ def setup_logger(name: str = None) -> logging.Logger:
     # Log startup message
     logger.info("="*60)
     logger.info("Trading Signal Bot Logger Initialized")
-    logger.info(f"Log Level: {config.LOG_LEVEL}")
-    logger.info(f"Log File: {config.LOG_FILE}")
+    logger.info("Log Level: %s", config.LOG_LEVEL)
+    logger.info("Log File: %s", config.LOG_FILE)
     logger.info("="*60)
     
     return logger
 
+def tail_jsonl(path: str, limit: int, chunk_size: int = 8192) -> list:
+    """
+    Decode the last JSON lines of a file without reading all of it.
+    
+    Args:
+        path: JSON-lines file
+        limit: Maximum number of lines to return
+        chunk_size: Bytes read per backward step
+        
+    Returns:
+        List of decoded records, oldest first (malformed lines are skipped)
+    """
+    if limit <= 0 or not os.path.exists(path):
+        return []
+    
+    with open(path, 'rb') as f:
+        position = f.seek(0, os.SEEK_END)
+        buffer = b''
+        
+        # Read backwards until the buffer holds more than `limit` line breaks
+        while position > 0 and buffer.count(b'\n') <= limit:
+            step = min(chunk_size, position)
+            position -= step
+            f.seek(position)
+            buffer = f.read(step) + buffer
+    
+    lines = buffer.splitlines()
+    if position > 0:
+        # The first line may have been cut in the middle
+        lines = lines[1:]
+    
+    records = []
+    for line in lines[-limit:]:
+        try:
+            records.append(_loads(line))
+        except ValueError:
+            continue
+    
+    return records
+
+class SignalStats:
+    """
+    Running signal totals over a JSON-lines signal log and its rotated backups.
+    
+    Totals survive size rotation: the rotated-away file is drained through the
+    handle still open on it and counting continues on the new file. Only a
+    file replaced by cleanup_old_logs, or truncated, triggers a rescan.
+    """
+    
+    def __init__(self, path: str, backup_count: int = CONFIG.LOG_BACKUP_COUNT):
+        """
+        Initialize the totals; the first refresh scans the backups and the file once.
+        
+        Args:
+            path: JSON-lines signal log file
+            backup_count: Number of rotated backups (path.1 ... path.N) to include
+        """
+        self.path = path
+        self.backup_count = backup_count
+        self._lock = threading.Lock()
+        self._file = None
+        self._reset()
+    
+    def _reset(self):
+        """Forget all totals and close the file."""
+        self._close()
+        self.count = 0
+        self.confidence_sum = 0
+        self.by_type = Counter()
+    
+    def _close(self):
+        """Close the current file, keeping the totals."""
+        if self._file is not None:
+            self._file.close()
+        self._file = None
+        self._identity = None
+        self._offset = 0
+        self._partial = b''
+    
+    def _open(self):
+        """Open the log file and remember which file it is."""
+        self._file = open(self.path, 'rb')
+        opened = os.fstat(self._file.fileno())
+        self._identity = (opened.st_dev, opened.st_ino)
+    
+    def _rescan(self):
+        """Recount from scratch: rotated backups oldest first, then the open log."""
+        self._reset()
+        
+        for index in range(self.backup_count, 0, -1):
+            try:
+                with open(f"{self.path}.{index}", 'rb') as f:
+                    self._add(f.read() + b'\n')
+            except FileNotFoundError:
+                continue
+        
+        self._open()
+    
+    def _is_rotated(self) -> bool:
+        """Whether the open file is now the first rotated backup."""
+        try:
+            stat = os.stat(f"{self.path}.1")
+        except FileNotFoundError:
+            return False
+        return (stat.st_dev, stat.st_ino) == self._identity
+    
+    def _add(self, data: bytes):
+        """Add complete lines to the totals, holding back a trailing partial line."""
+        lines = (self._partial + data).split(b'\n')
+        self._partial = lines.pop()
+        
+        for line in lines:
+            try:
+                signal_data = _loads(line)
+            except ValueError:
+                continue
+            if not isinstance(signal_data, dict):
+                continue
+            
+            self.by_type[signal_data.get('signal', 'HOLD')] += 1
+            self.confidence_sum += signal_data.get('confidence', 0)
+            self.count += 1
+    
+    def refresh(self) -> dict:
+        """
+        Add the lines appended since the last refresh to the totals.
+        
+        The file stays open between refreshes, so only the new bytes are read
+        from the current position; a trailing line without its newline is held
+        back until the rest of it is written.
+        
+        Returns:
+            Dict with the signal count, confidence sum and counts per signal type
+        """
+        with self._lock:
+            try:
+                stat = os.stat(self.path)
+            except FileNotFoundError:
+                if self._file is not None and self._is_rotated():
+                    # Rotated, and the new file is only created on the next write
+                    self._add(self._file.read() + b'\n')
+                    self._close()
+                else:
+                    self._reset()
+                return self._snapshot()
+            
+            if self._file is None:
+                self._rescan()
+            elif (stat.st_dev, stat.st_ino) != self._identity:
+                if self._is_rotated():
+                    # Finish the rotated file, then carry on with the new one
+                    self._add(self._file.read() + b'\n')
+                    self._close()
+                    self._open()
+                else:
+                    # Replaced by cleanup_old_logs: entries were dropped
+                    self._rescan()
+            elif stat.st_size < self._offset:
+                self._rescan()
+            
+            data = self._file.read()
+            if data:
+                self._offset += len(data)
+                self._add(data)
+            
+            return self._snapshot()
+    
+    def _snapshot(self) -> dict:
+        """Copy the current totals."""
+        return {
+            'count': self.count,
+            'confidence_sum': self.confidence_sum,
+            'by_type': dict(self.by_type)
+        }
+
+# Compact lines from _JsonLineFormatter, and the spaced form of older files
+_TIMESTAMP_PREFIXES = (b'{"timestamp":"', b'{"timestamp": "')
+
+def _entry_timestamp(line: bytes) -> datetime:
+    """
+    Get the timestamp of a JSON log line.
+    
+    Lines written by _write_to_file start with the timestamp field, so it is
+    sliced out directly; other lines fall back to a full JSON decode.
+    
+    Args:
+        line: Raw JSON line
+        
+    Returns:
+        Entry timestamp
+        
+    Raises:
+        ValueError, KeyError, TypeError: If the line has no usable timestamp
+    """
+    for prefix in _TIMESTAMP_PREFIXES:
+        if line.startswith(prefix):
+            end = line.find(b'"', len(prefix))
+            try:
+                return datetime.fromisoformat(line[len(prefix):end].decode('ascii'))
+            except (ValueError, UnicodeDecodeError):
+                break
+    
+    return datetime.fromisoformat(_loads(line)['timestamp'])
+
 class TradingBotLogger:
     """Custom logger class with trading-specific methods."""
     
@@ -100,14 +412,14 @@ class TradingBotLogger:
                 'individual_signals': signal_data.get('individual_signals', [])
             }
             
-            # Log to main logger
-            self.logger.info(f"SIGNAL | {symbol} | {signal} | {confidence:.1f}% | {reason}")
+            # Log to main logger (formatted lazily, only if INFO is enabled)
+            self.logger.info("SIGNAL | %s | %s | %.1f%% | %s", symbol, signal, confidence, reason)
             
             # Log to signals file
             self._write_to_file(self.signal_log_file, log_entry)
             
         except Exception as e:
-            self.logger.error(f"Error logging signal: {str(e)}")
+            self.logger.error("Error logging signal: %s", e)
     
     def log_api_call(self, api_name: str, symbol: str, success: bool, response_time: float = None, error: str = None):
         """
@@ -120,15 +432,18 @@ class TradingBotLogger:
             response_time: Response time in seconds
             error: Error message if call failed
         """
+        if not self.logger.isEnabledFor(logging.INFO):
+            return
+        
         try:
             status = "SUCCESS" if success else "FAILED"
             time_str = f" | {response_time:.2f}s" if response_time else ""
             error_str = f" | {error}" if error else ""
             
-            self.logger.info(f"API | {api_name} | {symbol} | {status}{time_str}{error_str}")
+            self.logger.info("API | %s | %s | %s%s%s", api_name, symbol, status, time_str, error_str)
             
         except Exception as e:
-            self.logger.error(f"Error logging API call: {str(e)}")
+            self.logger.error("Error logging API call: %s", e)
     
     def log_bot_cycle(self, cycle_duration: float, signals_processed: int, alerts_sent: int):
         """
@@ -141,12 +456,12 @@ class TradingBotLogger:
         """
         try:
             self.logger.info(
-                f"CYCLE | Duration: {cycle_duration:.2f}s | "
-                f"Signals: {signals_processed} | Alerts: {alerts_sent}"
+                "CYCLE | Duration: %.2fs | Signals: %d | Alerts: %d",
+                cycle_duration, signals_processed, alerts_sent
             )
             
         except Exception as e:
-            self.logger.error(f"Error logging bot cycle: {str(e)}")
+            self.logger.error("Error logging bot cycle: %s", e)
     
     def log_error_with_context(self, error: Exception, context: dict = None):
         """
@@ -165,40 +480,33 @@ class TradingBotLogger:
             }
             
             # Log to main logger
-            self.logger.error(f"ERROR | {type(error).__name__} | {str(error)}")
+            self.logger.error("ERROR | %s | %s", type(error).__name__, error)
             
             # Log context if provided
             if context:
                 for key, value in context.items():
-                    self.logger.error(f"CONTEXT | {key}: {value}")
+                    self.logger.error("CONTEXT | %s: %s", key, value)
             
             # Log to errors file
             self._write_to_file(self.error_log_file, error_data)
             
         except Exception as e:
-            self.logger.error(f"Error logging error: {str(e)}")
+            self.logger.error("Error logging error: %s", e)
     
     def _write_to_file(self, filename: str, data: dict):
         """
-        Write structured data to log file.
+        Queue structured data for writing to a log file.
         
         Args:
             filename: Log file name
             data: Data to write
         """
         try:
-            import json
-            
-            # Ensure log directory exists
-            log_dir = os.path.dirname(filename) if os.path.dirname(filename) else '.'
-            os.makedirs(log_dir, exist_ok=True)
-            
-            # Append to file
-            with open(filename, 'a', encoding='utf-8') as f:
-                f.write(json.dumps(data, default=str) + '\n')
+            # Serialization and the append happen on the listener thread
+            _get_structured_logger(filename).info(filename, extra={'log_data': data})
                 
         except Exception as e:
-            self.logger.error(f"Error writing to log file {filename}: {str(e)}")
+            self.logger.error("Error writing to log file %s: %s", filename, e)
     
     def get_recent_signals(self, limit: int = 10) -> list:
         """
@@ -211,24 +519,10 @@ class TradingBotLogger:
             List of recent signal dicts
         """
         try:
-            import json
-            
-            if not os.path.exists(self.signal_log_file):
-                return []
-            
-            signals = []
-            with open(self.signal_log_file, 'r', encoding='utf-8') as f:
-                for line in f.readlines()[-limit:]:
-                    try:
-                        signal_data = json.loads(line.strip())
-                        signals.append(signal_data)
-                    except json.JSONDecodeError:
-                        continue
-            
-            return signals
+            return tail_jsonl(self.signal_log_file, limit)
             
         except Exception as e:
-            self.logger.error(f"Error reading recent signals: {str(e)}")
+            self.logger.error("Error reading recent signals: %s", e)
             return []
     
     def get_recent_errors(self, limit: int = 10) -> list:
@@ -242,24 +536,10 @@ class TradingBotLogger:
             List of recent error dicts
         """
         try:
-            import json
-            
-            if not os.path.exists(self.error_log_file):
-                return []
-            
-            errors = []
-            with open(self.error_log_file, 'r', encoding='utf-8') as f:
-                for line in f.readlines()[-limit:]:
-                    try:
-                        error_data = json.loads(line.strip())
-                        errors.append(error_data)
-                    except json.JSONDecodeError:
-                        continue
-            
-            return errors
+            return tail_jsonl(self.error_log_file, limit)
             
         except Exception as e:
-            self.logger.error(f"Error reading recent errors: {str(e)}")
+            self.logger.error("Error reading recent errors: %s", e)
             return []
     
     def cleanup_old_logs(self, days_to_keep: int = 30):
@@ -270,7 +550,6 @@ class TradingBotLogger:
             days_to_keep: Number of days of logs to keep
         """
         try:
-            import json
             from datetime import timedelta
             
             cutoff_date = datetime.now() - timedelta(days=days_to_keep)
@@ -282,26 +561,33 @@ class TradingBotLogger:
                 temp_file = f"{log_file}.temp"
                 kept_entries = 0
                 
-                with open(log_file, 'r', encoding='utf-8') as infile, \
-                     open(temp_file, 'w', encoding='utf-8') as outfile:
-                    
-                    for line in infile:
+                with open(log_file, 'rb') as infile, open(temp_file, 'wb') as outfile:
+                    # Entries are appended in time order: skip old lines until
+                    # the first one inside the window, then copy the rest as is
+                    while True:
+                        line = infile.readline()
+                        if not line:
+                            break
+                        
                         try:
-                            entry = json.loads(line.strip())
-                            entry_date = datetime.fromisoformat(entry['timestamp'])
-                            
-                            if entry_date >= cutoff_date:
+                            if _entry_timestamp(line) >= cutoff_date:
                                 outfile.write(line)
                                 kept_entries += 1
-                                
-                        except (json.JSONDecodeError, KeyError, ValueError):
+                                break
+                        except (KeyError, TypeError, ValueError):
                             # Keep malformed entries
                             outfile.write(line)
                             kept_entries += 1
+                    
+                    remainder = infile.read()
+                    outfile.write(remainder)
+                    kept_entries += remainder.count(b'\n')
+                    if remainder and not remainder.endswith(b'\n'):
+                        kept_entries += 1
                 
                 # Replace original file
                 os.replace(temp_file, log_file)
-                self.logger.info(f"Cleaned up {log_file}, kept {kept_entries} entries")
+                self.logger.info("Cleaned up %s, kept %d entries", log_file, kept_entries)
                 
         except Exception as e:
-            self.logger.error(f"Error cleaning up logs: {str(e)}")
+            self.logger.error("Error cleaning up logs: %s", e)
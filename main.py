@@ -6,44 +6,99 @@ and sends high-confidence signals to Telegram.
 """
 
 import asyncio
-import schedule
-import time
+import os
+import pickle
+import signal
+import sys
 import threading
+import numpy as np
+from collections import deque
 from datetime import datetime
+from functools import lru_cache
 import logging
-from typing import Dict, List
+from typing import Dict, List, Optional, Tuple
 
-from config import Config
-from api_handlers import DataFetcher
+from config import CONFIG
+from api_handlers import DataFetcher, close_shared_session
 from indicators import TechnicalIndicators
-from signal_processor import SignalProcessor
+from signal_processor import SignalProcessor, SOURCE_CODES
 from telegram_bot import TelegramBot
 from logger import setup_logger
 from web_dashboard import app
 
+try:
+    from waitress import serve
+except ImportError:  # waitress is optional, Flask's threaded dev server is used instead
+    serve = None
+
+# Telegram alert layout, filled in per alert with str.format_map
+_ALERT_TEMPLATE = """📊 Strong Signal Alert
+Pair: {symbol}
+Signal: {signal}
+Entry: ${entry:.2f}
+SL: ${stop_loss:.2f}
+TP: ${take_profit:.2f}
+Timeframe: 15min to 1hr
+Confidence: {confidence:.0f}%
+Reason: {reason}"""
+
+# (stop loss, take profit) multipliers of the entry price per signal type
+_ALERT_LEVELS = {
+    'BUY': (0.99, 1.02),   # 1% stop loss, 2% take profit
+    'SELL': (1.01, 0.98)   # 1% stop loss, 2% take profit
+}
+
+@lru_cache(maxsize=128)
+def _render_alert(symbol: str, signal: str, entry_price: float, confidence: float, reason: str) -> str:
+    """Fill in the alert template; repeated alerts during consolidation reuse the text."""
+    stop_factor, profit_factor = _ALERT_LEVELS.get(signal, _ALERT_LEVELS['SELL'])
+    
+    return _ALERT_TEMPLATE.format_map({
+        'symbol': symbol,
+        'signal': signal,
+        'entry': entry_price,
+        'stop_loss': entry_price * stop_factor,
+        'take_profit': entry_price * profit_factor,
+        'confidence': confidence,
+        'reason': reason
+    })
+
 class TradingBot:
     def __init__(self):
         """Initialize the trading bot with all necessary components."""
         self.logger = setup_logger()
-        self.config = Config()
+        self.config = CONFIG
         self.data_fetcher = DataFetcher()
         self.indicators = TechnicalIndicators()
         self.signal_processor = SignalProcessor()
         self.telegram_bot = TelegramBot()
         self.last_signals = {}
         self.is_running = True  # Bot starts running by default
+        self._stop_event = asyncio.Event()
+        self._loop = None
         self.bot_status = {
             'running': True,
             'last_run': None,
             'total_signals_sent': 0,
-            'errors': [],
+            'errors': deque(maxlen=100),  # Bounded; appends are thread-safe
             'current_signals': {}
         }
         
+        self._load_state()
+        
     def get_status(self):
-        """Get current bot status for web dashboard."""
+        """
+        Get current bot status for web dashboard.
+        
+        Returns a shallow snapshot taken without locking, so dashboard threads
+        never iterate the containers the scheduler loop is updating.
+        """
         self.bot_status['running'] = self.is_running
-        return self.bot_status
+        return dict(
+            self.bot_status,
+            errors=list(self.bot_status['errors']),
+            current_signals=dict(self.bot_status['current_signals'])
+        )
         
     async def analyze_asset(self, symbol: str) -> Dict:
         """
@@ -55,209 +110,334 @@ class TradingBot:
         Returns:
             Dict containing analysis results and signals
         """
+        data = await self._fetch_asset_data(symbol)
+        
+        indicators_data = {}
+        if data and 'price_data' in data:
+            indicators_data = self.indicators.calculate_all_indicators(data['price_data'], symbol)
+        
+        return self._analyze_fetched_batch([symbol], [data], {symbol: indicators_data})[0]
+    
+    async def _fetch_asset_data(self, symbol: str) -> Dict:
+        """
+        Fetch market data for a single asset.
+        
+        Args:
+            symbol: Trading symbol (e.g., 'BTC/USD')
+            
+        Returns:
+            Asset data dict, or a dict with an 'error' key if fetching failed
+        """
         try:
             self.logger.info(f"Analyzing {symbol}...")
             
             # Fetch data from multiple sources
-            data = await self.data_fetcher.get_asset_data(symbol)
-            
-            if not data or 'price_data' not in data:
-                self.logger.warning(f"No data available for {symbol}")
-                return {'symbol': symbol, 'signals': [], 'error': 'No data available'}
-            
-            # Calculate technical indicators
-            indicators_data = self.indicators.calculate_all_indicators(data['price_data'])
-            
-            # Generate signals from each indicator
-            signals = []
-            
-            # RSI Signal
-            rsi_signal = self._generate_rsi_signal(indicators_data.get('rsi'))
-            if rsi_signal:
-                signals.append(rsi_signal)
-            
-            # MACD Signal
-            macd_signal = self._generate_macd_signal(indicators_data.get('macd'))
-            if macd_signal:
-                signals.append(macd_signal)
-            
-            # Bollinger Bands Signal
-            bb_signal = self._generate_bollinger_signal(
-                data['price_data'], indicators_data.get('bollinger')
-            )
-            if bb_signal:
-                signals.append(bb_signal)
-            
-            # Moving Average Crossover Signal
-            ma_signal = self._generate_ma_crossover_signal(indicators_data.get('ma'))
-            if ma_signal:
-                signals.append(ma_signal)
-            
-            # Volume Spike Signal
-            volume_signal = self._generate_volume_signal(data.get('volume_data'))
-            if volume_signal:
-                signals.append(volume_signal)
-            
-            return {
-                'symbol': symbol,
-                'current_price': data.get('current_price', 0),
-                'signals': signals,
-                'indicators': indicators_data,
-                'timestamp': datetime.now().isoformat()
-            }
+            return await self.data_fetcher.get_asset_data(symbol)
             
         except Exception as e:
             self.logger.error(f"Error analyzing {symbol}: {str(e)}")
             self.bot_status['errors'].append(f"{symbol}: {str(e)}")
-            return {'symbol': symbol, 'signals': [], 'error': str(e)}
-    
-    def _generate_rsi_signal(self, rsi_data: Dict) -> Dict:
-        """Generate RSI-based trading signal."""
-        if not rsi_data or 'current' not in rsi_data:
-            return None
-        
-        rsi_value = rsi_data['current']
-        confidence = 0
-        signal_type = 'HOLD'
-        reason = f"RSI: {rsi_value:.2f}"
-        
-        if rsi_value <= 30:  # Oversold
-            signal_type = 'BUY'
-            confidence = min(95, (30 - rsi_value) * 3 + 70)
-            reason += " (Oversold condition)"
-        elif rsi_value >= 70:  # Overbought
-            signal_type = 'SELL'
-            confidence = min(95, (rsi_value - 70) * 3 + 70)
-            reason += " (Overbought condition)"
-        elif 45 <= rsi_value <= 55:  # Neutral
-            confidence = 60
-            reason += " (Neutral zone)"
-        
-        return {
-            'source': 'RSI',
-            'signal': signal_type,
-            'confidence': confidence,
-            'reason': reason
-        }
+            return {'error': str(e)}
     
-    def _generate_macd_signal(self, macd_data: Dict) -> Dict:
-        """Generate MACD-based trading signal."""
-        if not macd_data or 'macd' not in macd_data or 'signal' not in macd_data:
-            return None
+    def _analyze_fetched_batch(self, symbols: List[str], fetched: List[Dict],
+                               indicator_results: Dict[str, Dict]) -> List[Dict]:
+        """
+        Generate signals for a batch of assets from their fetched data and indicators.
         
-        macd_line = macd_data['macd']
-        signal_line = macd_data['signal']
-        histogram = macd_data.get('histogram', 0)
+        Args:
+            symbols: Trading symbols (e.g., 'BTC/USD'), aligned with fetched
+            fetched: Asset data from _fetch_asset_data() for each symbol
+            indicator_results: Technical indicators keyed by symbol
+            
+        Returns:
+            List of dicts containing analysis results and signals, one per symbol
+        """
+        results = [None] * len(symbols)
+        ready = []
         
-        confidence = 0
-        signal_type = 'HOLD'
-        reason = "MACD analysis"
+        for position, (symbol, data) in enumerate(zip(symbols, fetched)):
+            if not data or 'price_data' not in data:
+                if data and 'error' in data:
+                    results[position] = {'symbol': symbol, 'signals': [], 'error': data['error']}
+                else:
+                    self.logger.warning(f"No data available for {symbol}")
+                    results[position] = {'symbol': symbol, 'signals': [], 'error': 'No data available'}
+                continue
+            ready.append(position)
         
-        # MACD crossover signals
-        if macd_line > signal_line and histogram > 0:
-            signal_type = 'BUY'
-            confidence = min(90, abs(histogram) * 20 + 65)
-            reason = "MACD bullish crossover"
-        elif macd_line < signal_line and histogram < 0:
-            signal_type = 'SELL'
-            confidence = min(90, abs(histogram) * 20 + 65)
-            reason = "MACD bearish crossover"
+        try:
+            # Generate signals for every indicator of every asset in one pass
+            signal_lists = self._generate_signals_batch([
+                (fetched[position], indicator_results.get(symbols[position], {}))
+                for position in ready
+            ])
+            
+            timestamp = datetime.now().isoformat()
+            for position, signals in zip(ready, signal_lists):
+                results[position] = {
+                    'symbol': symbols[position],
+                    'current_price': fetched[position].get('current_price', 0),
+                    'signals': signals,
+                    'indicators': indicator_results.get(symbols[position], {}),
+                    'timestamp': timestamp
+                }
+            
+        except Exception as e:
+            for position in ready:
+                symbol = symbols[position]
+                self.logger.error(f"Error analyzing {symbol}: {str(e)}")
+                self.bot_status['errors'].append(f"{symbol}: {str(e)}")
+                results[position] = {'symbol': symbol, 'signals': [], 'error': str(e)}
         
-        return {
-            'source': 'MACD',
-            'signal': signal_type,
-            'confidence': confidence,
-            'reason': reason
-        }
+        return results
     
-    def _generate_bollinger_signal(self, price_data: List, bb_data: Dict) -> Dict:
-        """Generate Bollinger Bands-based trading signal."""
-        if not bb_data or not price_data or 'upper' not in bb_data:
-            return None
+    def _generate_signals_batch(self, analyses: List[Tuple[Dict, Dict]]) -> List[List[Dict]]:
+        """
+        Generate RSI, MACD, Bollinger Bands, MA crossover and volume signals for many assets.
         
-        current_price = price_data[-1]
-        upper_band = bb_data['upper']
-        lower_band = bb_data['lower']
-        middle_band = bb_data['middle']
+        Latest indicator values are gathered into one column per input so each
+        signal rule is evaluated with a single vectorized expression.
         
-        confidence = 0
-        signal_type = 'HOLD'
-        reason = "Bollinger Bands analysis"
+        Args:
+            analyses: (asset data, indicators) pairs, one per asset
+            
+        Returns:
+            List of signal lists, aligned with analyses
+        """
+        count = len(analyses)
         
-        # Price near bands
-        if current_price <= lower_band:
-            signal_type = 'BUY'
-            confidence = min(85, ((lower_band - current_price) / lower_band) * 100 + 70)
-            reason = "Price touching lower Bollinger Band"
-        elif current_price >= upper_band:
-            signal_type = 'SELL'
-            confidence = min(85, ((current_price - upper_band) / upper_band) * 100 + 70)
-            reason = "Price touching upper Bollinger Band"
+        rsi = np.full(count, np.nan)
+        macd_line = np.full(count, np.nan)
+        macd_signal = np.full(count, np.nan)
+        macd_hist = np.zeros(count)
+        current_price = np.full(count, np.nan)
+        bb_upper = np.full(count, np.nan)
+        bb_lower = np.full(count, np.nan)
+        ma50 = np.full(count, np.nan)
+        ma200 = np.full(count, np.nan)
+        ma50_prev = np.full(count, np.nan)
+        ma200_prev = np.full(count, np.nan)
+        has_rsi = np.zeros(count, dtype=bool)
+        has_macd = np.zeros(count, dtype=bool)
+        has_bb = np.zeros(count, dtype=bool)
+        has_ma = np.zeros(count, dtype=bool)
+        volume_rows = []
+        volume_windows = []
         
-        return {
-            'source': 'Bollinger Bands',
-            'signal': signal_type,
-            'confidence': confidence,
-            'reason': reason
-        }
-    
-    def _generate_ma_crossover_signal(self, ma_data: Dict) -> Dict:
-        """Generate Moving Average crossover signal."""
-        if not ma_data or 'ma50' not in ma_data or 'ma200' not in ma_data:
-            return None
+        for row, (data, indicators_data) in enumerate(analyses):
+            rsi_data = indicators_data.get('rsi')
+            if rsi_data and 'current' in rsi_data:
+                has_rsi[row] = True
+                rsi[row] = rsi_data['current']
+            
+            macd_data = indicators_data.get('macd')
+            if macd_data and 'macd' in macd_data and 'signal' in macd_data:
+                has_macd[row] = True
+                macd_line[row] = macd_data['macd']
+                macd_signal[row] = macd_data['signal']
+                macd_hist[row] = macd_data.get('histogram', 0)
+            
+            price_data = data['price_data']
+            bb_data = indicators_data.get('bollinger')
+            if bb_data and price_data is not None and len(price_data) > 0 and 'upper' in bb_data:
+                has_bb[row] = True
+                current_price[row] = price_data[-1]
+                bb_upper[row] = bb_data['upper']
+                bb_lower[row] = bb_data['lower']
+            
+            ma_data = indicators_data.get('ma')
+            if ma_data and 'ma50' in ma_data and 'ma200' in ma_data:
+                has_ma[row] = True
+                ma50[row] = ma_data['ma50']
+                ma200[row] = ma_data['ma200']
+                ma50_prev[row] = ma_data.get('ma50_prev', ma_data['ma50'])
+                ma200_prev[row] = ma_data.get('ma200_prev', ma_data['ma200'])
+            
+            volume_data = data.get('volume_data')
+            if volume_data is not None and len(volume_data) >= 20:
+                volume_rows.append(row)
+                volume_windows.append(np.asarray(volume_data[-20:], dtype=np.float64))
         
-        ma50 = ma_data['ma50']
-        ma200 = ma_data['ma200']
-        ma50_prev = ma_data.get('ma50_prev', ma50)
-        ma200_prev = ma_data.get('ma200_prev', ma200)
+        with np.errstate(divide='ignore', invalid='ignore'):
+            # RSI: oversold / overbought / neutral zone
+            rsi_buy = rsi <= 30
+            rsi_sell = rsi >= 70
+            rsi_neutral = (rsi >= 45) & (rsi <= 55)
+            rsi_type = np.select([rsi_buy, rsi_sell], ['BUY', 'SELL'], 'HOLD')
+            rsi_conf = np.select(
+                [rsi_buy, rsi_sell, rsi_neutral],
+                [np.minimum(95, (30 - rsi) * 3 + 70), np.minimum(95, (rsi - 70) * 3 + 70), 60],
+                0
+            )
+            rsi_note = np.select(
+                [rsi_buy, rsi_sell, rsi_neutral],
+                [" (Oversold condition)", " (Overbought condition)", " (Neutral zone)"],
+                ""
+            )
+            
+            # MACD crossover signals
+            macd_buy = (macd_line > macd_signal) & (macd_hist > 0)
+            macd_sell = (macd_line < macd_signal) & (macd_hist < 0)
+            macd_type = np.select([macd_buy, macd_sell], ['BUY', 'SELL'], 'HOLD')
+            macd_conf = np.where(macd_buy | macd_sell, np.minimum(90, np.abs(macd_hist) * 20 + 65), 0)
+            macd_reason = np.select(
+                [macd_buy, macd_sell], ["MACD bullish crossover", "MACD bearish crossover"], "MACD analysis"
+            )
+            
+            # Price near Bollinger Bands
+            bb_buy = current_price <= bb_lower
+            bb_sell = ~bb_buy & (current_price >= bb_upper)
+            bb_type = np.select([bb_buy, bb_sell], ['BUY', 'SELL'], 'HOLD')
+            bb_conf = np.select(
+                [bb_buy, bb_sell],
+                [np.minimum(85, (bb_lower - current_price) / bb_lower * 100 + 70),
+                 np.minimum(85, (current_price - bb_upper) / bb_upper * 100 + 70)],
+                0
+            )
+            bb_reason = np.select(
+                [bb_buy, bb_sell],
+                ["Price touching lower Bollinger Band", "Price touching upper Bollinger Band"],
+                "Bollinger Bands analysis"
+            )
+            
+            # Golden Cross / Death Cross (50 MA crossing the 200 MA)
+            ma_buy = (ma50 > ma200) & (ma50_prev <= ma200_prev)
+            ma_sell = (ma50 < ma200) & (ma50_prev >= ma200_prev)
+            ma_type = np.select([ma_buy, ma_sell], ['BUY', 'SELL'], 'HOLD')
+            ma_conf = np.where(ma_buy | ma_sell, 80, 0)
+            ma_reason = np.select(
+                [ma_buy, ma_sell],
+                ["Golden Cross: 50 MA crossed above 200 MA", "Death Cross: 50 MA crossed below 200 MA"],
+                "MA crossover analysis"
+            )
+            
+            # Volume spike: latest bar at least 2x the 20-bar average
+            volume_ratio = {}
+            if volume_rows:
+                windows = np.stack(volume_windows)
+                avg_volume = windows.mean(axis=1)
+                valid = np.isfinite(avg_volume) & (avg_volume > 0)
+                ratios = np.where(valid, windows[:, -1] / avg_volume, 1.0)
+                volume_ratio = dict(zip(volume_rows, ratios.tolist()))
         
-        confidence = 0
-        signal_type = 'HOLD'
-        reason = "MA crossover analysis"
+        rsi_values = rsi.tolist()
+        columns = [
+            (has_rsi, 'RSI', rsi_type, rsi_conf.tolist(), None),
+            (has_macd, 'MACD', macd_type, macd_conf.tolist(), macd_reason),
+            (has_bb, 'Bollinger Bands', bb_type, bb_conf.tolist(), bb_reason),
+            (has_ma, 'MA Crossover', ma_type, ma_conf.tolist(), ma_reason)
+        ]
         
-        # Golden Cross (50 MA crosses above 200 MA)
-        if ma50 > ma200 and ma50_prev <= ma200_prev:
-            signal_type = 'BUY'
-            confidence = 80
-            reason = "Golden Cross: 50 MA crossed above 200 MA"
-        # Death Cross (50 MA crosses below 200 MA)
-        elif ma50 < ma200 and ma50_prev >= ma200_prev:
-            signal_type = 'SELL'
-            confidence = 80
-            reason = "Death Cross: 50 MA crossed below 200 MA"
+        signal_lists = []
+        for row in range(count):
+            signals = []
+            for present, source, signal_type, confidence, reason in columns:
+                if not present[row]:
+                    continue
+                if reason is None:
+                    row_reason = f"RSI: {rsi_values[row]:.2f}{rsi_note[row]}"
+                else:
+                    row_reason = str(reason[row])
+                signals.append({
+                    'source': source,
+                    'source_code': SOURCE_CODES[source],
+                    'signal': str(signal_type[row]),
+                    'confidence': confidence[row],
+                    'reason': row_reason
+                })
+            
+            if row in volume_ratio:
+                ratio = volume_ratio[row]
+                if ratio >= 2.0:  # Volume is 2x average
+                    signals.append({
+                        'source': 'Volume Analysis',
+                        'source_code': SOURCE_CODES['Volume Analysis'],
+                        'signal': 'BUY',  # Assuming volume spike indicates buying interest
+                        'confidence': min(75, (ratio - 2) * 15 + 60),
+                        'reason': f"Strong volume spike: {ratio:.2f}x average"
+                    })
+                else:
+                    signals.append({
+                        'source': 'Volume Analysis',
+                        'source_code': SOURCE_CODES['Volume Analysis'],
+                        'signal': 'HOLD',
+                        'confidence': 0,
+                        'reason': f"Volume analysis (ratio: {ratio:.2f})"
+                    })
+            
+            signal_lists.append(signals)
         
-        return {
-            'source': 'MA Crossover',
-            'signal': signal_type,
-            'confidence': confidence,
-            'reason': reason
-        }
+        return signal_lists
     
-    def _generate_volume_signal(self, volume_data: List) -> Dict:
-        """Generate volume-based trading signal."""
-        if not volume_data or len(volume_data) < 20:
-            return None
-        
-        current_volume = volume_data[-1]
-        avg_volume = sum(volume_data[-20:]) / 20
-        volume_ratio = current_volume / avg_volume if avg_volume > 0 else 1
+    def _load_state(self):
+        """Restore indicator and bar state saved by a previous run, if any."""
+        try:
+            with open(self.config.STATE_FILE, 'rb') as f:
+                state = pickle.load(f)
+            
+            self.data_fetcher.import_state(state['data'])
+            if self.indicators.import_state(state['indicators']):
+                self.logger.info(f"Restored saved state from {self.config.STATE_FILE}")
+            else:
+                self.logger.info("Indicator periods changed, ignoring saved indicator state")
+                
+        except FileNotFoundError:
+            pass
+        except Exception as e:
+            self.logger.warning(f"Could not restore saved state: {str(e)}")
+    
+    def _save_state(self):
+        """Save indicator and bar state so a restart continues from this cycle."""
+        try:
+            state = {
+                'indicators': self.indicators.export_state(),
+                'data': self.data_fetcher.export_state()
+            }
+            
+            path = self.config.STATE_FILE
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+            temp_path = f"{path}.tmp"
+            
+            # Write then rename so a crash never leaves a partial file
+            with open(temp_path, 'wb') as f:
+                pickle.dump(state, f, protocol=pickle.HIGHEST_PROTOCOL)
+            os.replace(temp_path, path)
+            
+        except Exception as e:
+            self.logger.warning(f"Could not save state: {str(e)}")
+    
+    def _configure_event_loop(self):
+        """
+        Enable eager task execution on the running loop (Python 3.12+).
         
-        confidence = 0
-        signal_type = 'HOLD'
-        reason = f"Volume analysis (ratio: {volume_ratio:.2f})"
+        Fetch coroutines that finish without awaiting (cache hits, missing
+        API keys) then complete as soon as they are scheduled, without a loop
+        round-trip.
+        """
+        eager_task_factory = getattr(asyncio, 'eager_task_factory', None)
+        if sys.version_info >= (3, 12) and eager_task_factory is not None:
+            asyncio.get_running_loop().set_task_factory(eager_task_factory)
+    
+    def _install_signal_handlers(self):
+        """
+        Route SIGINT and SIGTERM to shutdown() so the scheduler stops cleanly.
         
-        # Volume spike detection
-        if volume_ratio >= 2.0:  # Volume is 2x average
-            signal_type = 'BUY'  # Assuming volume spike indicates buying interest
-            confidence = min(75, (volume_ratio - 2) * 15 + 60)
-            reason = f"Strong volume spike: {volume_ratio:.2f}x average"
+        The first signal lets the current cycle finish, saves state and closes
+        the shared session; the handlers are then removed, so a second Ctrl+C
+        interrupts immediately. Loops without signal support (Windows, or a
+        loop outside the main thread) keep the default KeyboardInterrupt.
+        """
+        def handle_stop_signal():
+            self.logger.info("Stop signal received, finishing current cycle")
+            for sig in (signal.SIGINT, signal.SIGTERM):
+                self._loop.remove_signal_handler(sig)
+            self.shutdown()
         
-        return {
-            'source': 'Volume Analysis',
-            'signal': signal_type,
-            'confidence': confidence,
-            'reason': reason
-        }
+        for sig in (signal.SIGINT, signal.SIGTERM):
+            try:
+                self._loop.add_signal_handler(sig, handle_stop_signal)
+            except (NotImplementedError, RuntimeError, ValueError):
+                return
     
     async def run_analysis_cycle(self):
         """Run a complete analysis cycle for all assets."""
@@ -271,31 +451,46 @@ class TradingBot:
             self.bot_status['last_run'] = datetime.now().isoformat()
             self.logger.info("Starting analysis cycle...")
             
-            # Analyze all assets
-            analysis_tasks = [
-                self.analyze_asset(symbol) for symbol in self.config.TRADING_SYMBOLS
-            ]
+            # Fetch all crypto spot prices in a single request up front
+            await self.data_fetcher.prefetch_crypto_prices(self.config.TRADING_SYMBOLS)
             
-            results = await asyncio.gather(*analysis_tasks, return_exceptions=True)
+            # Fetch all assets concurrently
+            symbols = self.config.TRADING_SYMBOLS
+            fetched = await asyncio.gather(*(self._fetch_asset_data(symbol) for symbol in symbols))
             
-            # Process results and generate consensus signals
-            for result in results:
-                if isinstance(result, dict) and 'signals' in result:
-                    symbol = result['symbol']
-                    
-                    # Process signals and determine consensus
-                    consensus = self.signal_processor.process_signals(result['signals'])
-                    
-                    # Store current signals for dashboard
-                    self.bot_status['current_signals'][symbol] = {
-                        'consensus': consensus,
-                        'price': result.get('current_price', 0),
-                        'timestamp': result.get('timestamp')
-                    }
-                    
-                    # Send Telegram alert if consensus is strong enough
-                    if consensus['confidence'] >= 80 and consensus['signal'] != 'HOLD':
-                        await self.send_trading_alert(symbol, result, consensus)
+            # Calculate indicators for every asset in one batch
+            price_histories = {
+                symbol: data['price_data']
+                for symbol, data in zip(symbols, fetched)
+                if data and 'price_data' in data
+            }
+            indicator_results = self.indicators.calculate_indicators_batch(price_histories)
+            
+            results = self._analyze_fetched_batch(symbols, fetched, indicator_results)
+            
+            # Process signals and determine consensus for every asset at once
+            results = [result for result in results if isinstance(result, dict) and 'signals' in result]
+            consensus_list = self.signal_processor.process_signals_batch([result['signals'] for result in results])
+            
+            alerts = []
+            for result, consensus in zip(results, consensus_list):
+                symbol = result['symbol']
+                
+                # Store current signals for dashboard
+                self.bot_status['current_signals'][symbol] = {
+                    'consensus': consensus,
+                    'price': result.get('current_price', 0),
+                    'timestamp': result.get('timestamp')
+                }
+                
+                # Queue a Telegram alert if consensus is strong enough
+                if consensus['confidence'] >= 80 and consensus['signal'] != 'HOLD':
+                    message = self._format_trading_alert(symbol, result, consensus)
+                    if message:
+                        alerts.append((symbol, consensus['signal'], message))
+            
+            if alerts:
+                await self.send_trading_alerts(alerts)
             
             self.logger.info("Analysis cycle completed successfully")
             
@@ -305,57 +500,115 @@ class TradingBot:
         finally:
             self.bot_status['running'] = False
     
-    async def send_trading_alert(self, symbol: str, analysis: Dict, consensus: Dict):
-        """Send trading alert to Telegram."""
+    def _format_trading_alert(self, symbol: str, analysis: Dict, consensus: Dict) -> Optional[str]:
+        """Format the Telegram alert text for a strong consensus signal."""
         try:
             current_price = analysis.get('current_price', 0)
             
-            # Calculate entry, stop loss, and take profit levels
-            entry_price = current_price
-            
-            if consensus['signal'] == 'BUY':
-                stop_loss = entry_price * 0.99  # 1% stop loss
-                take_profit = entry_price * 1.02  # 2% take profit
-            else:  # SELL
-                stop_loss = entry_price * 1.01  # 1% stop loss
-                take_profit = entry_price * 0.98  # 2% take profit
-            
-            # Format message
-            message = f"""📊 Strong Signal Alert
-Pair: {symbol}
-Signal: {consensus['signal']}
-Entry: ${entry_price:.2f}
-SL: ${stop_loss:.2f}
-TP: ${take_profit:.2f}
-Timeframe: 15min to 1hr
-Confidence: {consensus['confidence']:.0f}%
-Reason: {consensus['reason']}"""
+            # Entry, stop loss and take profit levels are derived from the current price
+            return _render_alert(
+                symbol, consensus['signal'], current_price, consensus['confidence'], consensus['reason']
+            )
             
-            # Send to Telegram
-            success = await self.telegram_bot.send_message(message)
+        except Exception as e:
+            self.logger.error(f"Error formatting alert for {symbol}: {str(e)}")
+            return None
+    
+    async def send_trading_alerts(self, alerts: List[Tuple[str, str, str]]):
+        """
+        Send a cycle's trading alerts to Telegram in as few messages as possible.
+        
+        Args:
+            alerts: (symbol, signal type, formatted message) per alert
+        """
+        try:
+            delivered = await self.telegram_bot.send_messages([message for _, _, message in alerts])
             
-            if success:
-                self.bot_status['total_signals_sent'] += 1
-                self.logger.info(f"Alert sent for {symbol}: {consensus['signal']}")
-            else:
-                self.logger.error(f"Failed to send alert for {symbol}")
+            for (symbol, signal, _), success in zip(alerts, delivered):
+                if success:
+                    self.bot_status['total_signals_sent'] += 1
+                    self.logger.info(f"Alert sent for {symbol}: {signal}")
+                else:
+                    self.logger.error(f"Failed to send alert for {symbol}")
                 
         except Exception as e:
-            self.logger.error(f"Error sending alert for {symbol}: {str(e)}")
+            for symbol, _, _ in alerts:
+                self.logger.error(f"Error sending alert for {symbol}: {str(e)}")
     
-    def schedule_bot(self):
-        """Schedule the bot to run every 10 minutes."""
-        schedule.every(10).minutes.do(lambda: asyncio.run(self.run_analysis_cycle()))
+    async def run_scheduler(self):
+        """
+        Run an analysis cycle every ANALYSIS_INTERVAL_MINUTES on the current event loop.
+        
+        The first cycle runs immediately. Cycles start on a fixed grid measured
+        from the first one, so the time a cycle takes does not push later runs
+        back. All cycles share this loop, so pooled HTTP connections survive
+        between ticks. Returns once shutdown() is called, which SIGINT and
+        SIGTERM trigger where the loop supports signal handlers.
+        """
+        self._loop = asyncio.get_running_loop()
+        self._configure_event_loop()
+        self._install_signal_handlers()
+        interval_seconds = self.config.ANALYSIS_INTERVAL_MINUTES * 60
+        
+        self.logger.info(f"Bot scheduled to run every {self.config.ANALYSIS_INTERVAL_MINUTES} minutes")
+        
+        try:
+            async with self.data_fetcher:
+                next_run = self._loop.time()
+                while not self._stop_event.is_set():
+                    await self.run_analysis_cycle()
+                    self._save_state()
+                    
+                    # Skip any slots a slow cycle overran instead of running back to back
+                    next_run += interval_seconds
+                    now = self._loop.time()
+                    if next_run < now:
+                        next_run += (now - next_run) // interval_seconds * interval_seconds + interval_seconds
+                    
+                    try:
+                        await asyncio.wait_for(self._stop_event.wait(), timeout=next_run - now)
+                    except asyncio.TimeoutError:
+                        pass
+        finally:
+            await self.data_fetcher.close()
+            await close_shared_session()
+    
+    def run_coroutine(self, coro, timeout: float = 60):
+        """
+        Run a coroutine on the scheduler's event loop from another thread.
         
-        self.logger.info("Bot scheduled to run every 10 minutes")
+        Lets callers such as the web dashboard reuse the bot's loop and open
+        HTTP sessions instead of creating a new loop per request. There is no
+        temporary-loop fallback: the shared aiohttp session would be bound to
+        that loop and left open when it closes.
         
-        while True:
-            schedule.run_pending()
-            time.sleep(60)  # Check every minute
+        Args:
+            coro: Coroutine to run
+            timeout: Seconds to wait for the result
+            
+        Returns:
+            The coroutine's result
+            
+        Raises:
+            RuntimeError: If the scheduler's event loop is not running
+        """
+        if not (self._loop and self._loop.is_running()):
+            coro.close()
+            raise RuntimeError("Bot event loop is not running")
+        return asyncio.run_coroutine_threadsafe(coro, self._loop).result(timeout)
+    
+    def shutdown(self):
+        """Stop the scheduler loop started by run_scheduler (safe to call from any thread)."""
+        if self._loop and not self._loop.is_closed():
+            self._loop.call_soon_threadsafe(self._stop_event.set)
 
 def run_web_dashboard():
     """Run the web dashboard in a separate thread."""
-    app.run(host='0.0.0.0', port=5000, debug=False)
+    if serve is not None:
+        # Production WSGI server with a small pool of request threads
+        serve(app, host='0.0.0.0', port=5000, threads=4)
+    else:
+        app.run(host='0.0.0.0', port=5000, debug=False, threaded=True)
 
 def main():
     """Main entry point."""
@@ -376,11 +629,9 @@ def main():
     print("\nPress Ctrl+C to stop...")
     
     try:
-        # Run initial analysis
-        asyncio.run(bot.run_analysis_cycle())
-        
-        # Start scheduled runs
-        bot.schedule_bot()
+        # Run the initial analysis and all scheduled runs on one event loop
+        asyncio.run(bot.run_scheduler())
+        print("\n🛑 Bot stopped")
         
     except KeyboardInterrupt:
         print("\n🛑 Bot stopped by user")
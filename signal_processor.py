@@ -4,9 +4,133 @@ Processes individual indicator signals and creates consensus signals.
 """
 
 import logging
-from typing import Dict, List
-from statistics import mean
-from collections import Counter
+import numpy as np
+from itertools import islice
+from numbers import Real
+from typing import Dict, List, Optional, Tuple
+
+try:
+    from numba import njit
+except ImportError:  # numba is optional, the kernel runs as plain Python
+    def njit(*args, **kwargs):
+        if len(args) == 1 and callable(args[0]) and not kwargs:
+            return args[0]
+        return lambda func: func
+
+# Integer codes for signal sources; signals carry them as 'source_code' so
+# weights are looked up by index instead of hashing the source name
+SOURCE_CODES = {
+    'RSI': 0,
+    'MACD': 1,
+    'Bollinger Bands': 2,
+    'MA Crossover': 3,
+    'Volume Analysis': 4,
+    'Stochastic': 5,
+    'Momentum': 6
+}
+UNKNOWN_SOURCE = len(SOURCE_CODES)
+
+# Signal weight per source code, with a final slot of 1.0 for unknown sources
+WEIGHT_TABLE = np.array([1.2, 1.5, 1.0, 1.3, 0.8, 0.9, 0.7, 1.0], dtype=np.float64)
+WEIGHT_TABLE.flags.writeable = False
+
+# Indicators whose strong agreement boosts the consensus confidence
+_STRONG_INDICATORS = frozenset(('RSI', 'MACD', 'MA Crossover'))
+_STRONG_TABLE = np.zeros(len(WEIGHT_TABLE), dtype=np.bool_)
+_STRONG_TABLE[[SOURCE_CODES[source] for source in _STRONG_INDICATORS]] = True
+
+# Signal type codes used when reducing signals as arrays; unknown types get
+# _OTHER, which is weighted as HOLD but only counted towards the total
+_SIGNAL_TYPES = ('BUY', 'SELL', 'HOLD')
+_SIGNAL_CODES = {signal_type: code for code, signal_type in enumerate(_SIGNAL_TYPES)}
+_HOLD = _SIGNAL_CODES['HOLD']
+_OTHER = len(_SIGNAL_TYPES)
+
+def _lightweight_view(signals: List[Dict]) -> List[Dict]:
+    """
+    Project signals onto the fields shown for individual signals.
+    
+    Args:
+        signals: Valid indicator signals
+        
+    Returns:
+        List of dicts with only source, signal and confidence
+    """
+    return [
+        {'source': s.get('source', 'Unknown'), 'signal': s['signal'], 'confidence': s['confidence']}
+        for s in signals
+    ]
+
+def _validate_signals(signals: List[Dict]) -> Tuple[List[Dict], Optional[str]]:
+    """
+    Keep the signals that can be reduced into a consensus.
+    
+    A signal is valid when it has a string 'signal' and a numeric
+    'confidence', so the array packing in the consensus cannot fail on it.
+    
+    Args:
+        signals: Individual indicator signals of one asset
+        
+    Returns:
+        Tuple of (valid signals, reason when there are none)
+    """
+    if not signals:
+        return [], 'No signals available'
+    
+    valid_signals = [
+        s for s in signals
+        if isinstance(s, dict)
+        and isinstance(s.get('signal'), str)
+        and isinstance(s.get('confidence'), Real)
+    ]
+    
+    if not valid_signals:
+        return [], 'No valid signals'
+    
+    return valid_signals, None
+
+@njit('Tuple((float64[:, ::1], float64[::1], float64[::1], int64[:, ::1], int64[:, ::1]))'
+      '(int32[::1], int8[::1], float64[::1], float64[::1], boolean[::1], int64)', cache=True)
+def _consensus_kernel(rows, codes, weights, confidences, strong, count):
+    """
+    Reduce the signals of many assets to their consensus sums in a single pass.
+    
+    Sums are accumulated in signal order, so they match adding the weighted
+    confidences one by one in Python.
+    
+    Args:
+        rows: Asset row of each signal
+        codes: Signal type code of each signal (_SIGNAL_CODES, or _OTHER)
+        weights: Source weight of each signal
+        confidences: Confidence of each signal
+        strong: Whether each signal comes from one of _STRONG_INDICATORS
+        count: Number of assets
+        
+    Returns:
+        Tuple of (BUY/SELL/HOLD weights, weighted confidence totals, weight
+        totals, signal counts per code, strong signal counts per code), each
+        with one row per asset
+    """
+    type_weights = np.zeros((count, 3))
+    total_confidence = np.zeros(count)
+    total_weight = np.zeros(count)
+    signal_counts = np.zeros((count, 4), dtype=np.int64)
+    strong_counts = np.zeros((count, 4), dtype=np.int64)
+    
+    for i in range(rows.shape[0]):
+        row = rows[i]
+        code = codes[i]
+        weighted = confidences[i] * weights[i]
+        
+        type_weights[row, min(code, 2)] += weighted
+        total_confidence[row] += weighted
+        total_weight[row] += weights[i]
+        
+        signal_counts[row, code] += 1
+        if strong[i] and confidences[i] >= 75:
+            strong_counts[row, code] += 1
+    
+    return type_weights, total_confidence, total_weight, signal_counts, strong_counts
 
 class SignalProcessor:
     """Process and aggregate trading signals from multiple indicators."""
@@ -14,16 +138,8 @@ class SignalProcessor:
     def __init__(self):
         self.logger = logging.getLogger(__name__)
         
-        # Signal weights for different indicators
-        self.signal_weights = {
-            'RSI': 1.2,
-            'MACD': 1.5,
-            'Bollinger Bands': 1.0,
-            'MA Crossover': 1.3,
-            'Volume Analysis': 0.8,
-            'Stochastic': 0.9,
-            'Momentum': 0.7
-        }
+        # Signal weights for different indicators, indexed by source code
+        self.weight_table = WEIGHT_TABLE
     
     def process_signals(self, signals: List[Dict]) -> Dict:
         """
@@ -35,95 +151,132 @@ class SignalProcessor:
         Returns:
             Dict containing consensus signal with confidence and reasoning
         """
-        if not signals:
-            return {
-                'signal': 'HOLD',
-                'confidence': 0,
-                'reason': 'No signals available',
-                'individual_signals': []
-            }
+        return self.process_signals_batch([signals])[0]
+    
+    def process_signals_batch(self, signal_lists: List[List[Dict]]) -> List[Dict]:
+        """
+        Process the signals of several assets into one consensus signal each.
         
-        try:
-            # Filter out invalid signals
-            valid_signals = [s for s in signals if s and 'signal' in s and 'confidence' in s]
+        The weighted sums for every asset are reduced together over flat
+        arrays of all their signals, instead of looping per asset.
+        
+        Args:
+            signal_lists: List of individual indicator signals per asset
+            
+        Returns:
+            List of consensus signal dicts, aligned with signal_lists
+        """
+        results: List[Dict] = [None] * len(signal_lists)
+        pending = []
+        
+        for index, signals in enumerate(signal_lists):
+            # Filter out invalid signals up front
+            valid_signals, error = _validate_signals(signals)
             
-            if not valid_signals:
-                return {
-                    'signal': 'HOLD', 
+            if error:
+                results[index] = {
+                    'signal': 'HOLD',
                     'confidence': 0,
-                    'reason': 'No valid signals',
+                    'reason': error,
                     'individual_signals': []
                 }
+                continue
             
-            # Calculate weighted consensus
-            consensus = self._calculate_weighted_consensus(valid_signals)
-            
-            # Determine final signal based on consensus
-            final_signal = self._determine_final_signal(consensus, valid_signals)
-            
-            return final_signal
-            
+            pending.append((index, valid_signals))
+        
+        # Calculate weighted consensus
+        try:
+            consensus_list = self._calculate_weighted_consensus([valid for _, valid in pending])
         except Exception as e:
             self.logger.error(f"Error processing signals: {str(e)}")
-            return {
-                'signal': 'HOLD',
-                'confidence': 0,
-                'reason': f'Processing error: {str(e)}',
-                'individual_signals': signals
-            }
+            for index, valid_signals in pending:
+                results[index] = {
+                    'signal': 'HOLD',
+                    'confidence': 0,
+                    'reason': f'Processing error: {str(e)}',
+                    'individual_signals': _lightweight_view(valid_signals)
+                }
+            return results
+        
+        # Determine final signal based on consensus
+        for (index, valid_signals), consensus in zip(pending, consensus_list):
+            results[index] = self._determine_final_signal(consensus, valid_signals)
+        
+        return results
     
-    def _calculate_weighted_consensus(self, signals: List[Dict]) -> Dict:
+    def _calculate_weighted_consensus(self, signal_lists: List[List[Dict]]) -> List[Dict]:
         """
         Calculate weighted consensus from individual signals.
         
+        Signals of all assets are packed into flat arrays (asset row, signal
+        type code, source code, confidence) and reduced by _consensus_kernel
+        in one pass, which also tallies the agreement counts used by
+        _apply_signal_filters.
+        
         Args:
-            signals: List of valid signals
+            signal_lists: List of valid signals per asset
             
         Returns:
-            Dict with consensus metrics
+            List of dicts with consensus metrics, one per asset
         """
-        buy_weight = 0
-        sell_weight = 0
-        hold_weight = 0
-        total_confidence = 0
-        total_weight = 0
-        
-        signal_reasons = []
-        
-        for signal in signals:
-            signal_type = signal['signal']
-            confidence = signal['confidence']
-            source = signal.get('source', 'Unknown')
-            reason = signal.get('reason', '')
-            
-            # Get weight for this signal source
-            weight = self.signal_weights.get(source, 1.0)
-            weighted_confidence = confidence * weight
-            
-            if signal_type == 'BUY':
-                buy_weight += weighted_confidence
-                signal_reasons.append(f"{source}: BUY ({confidence:.0f}%)")
-            elif signal_type == 'SELL':
-                sell_weight += weighted_confidence
-                signal_reasons.append(f"{source}: SELL ({confidence:.0f}%)")
-            else:  # HOLD
-                hold_weight += weighted_confidence
-                signal_reasons.append(f"{source}: HOLD ({confidence:.0f}%)")
-            
-            total_confidence += weighted_confidence
-            total_weight += weight
+        rows = []
+        codes = []
+        source_codes = []
+        confidences = []
+        signal_reasons = [[] for _ in signal_lists]
         
-        # Calculate average confidence
-        avg_confidence = total_confidence / total_weight if total_weight > 0 else 0
+        for row, signals in enumerate(signal_lists):
+            for signal in signals:
+                confidence = signal['confidence']
+                source = signal.get('source', 'Unknown')
+                code = _SIGNAL_CODES.get(signal['signal'], _OTHER)
+                source_code = signal.get('source_code')
+                if source_code is None:
+                    source_code = SOURCE_CODES.get(source, UNKNOWN_SOURCE)
+                
+                rows.append(row)
+                codes.append(code)
+                source_codes.append(source_code)
+                confidences.append(confidence)
+                
+                # Anything that is not BUY or SELL counts as HOLD; the reason
+                # text is only formatted for the final signal type
+                signal_reasons[row].append((source, min(code, _HOLD), confidence))
         
-        return {
-            'buy_weight': buy_weight,
-            'sell_weight': sell_weight,
-            'hold_weight': hold_weight,
-            'avg_confidence': avg_confidence,
-            'signal_reasons': signal_reasons,
-            'total_signals': len(signals)
-        }
+        # Codes are packed narrow; weights and confidences stay float64 so the
+        # sums (and the thresholds applied to them) match exact Python floats
+        source_codes = np.array(source_codes, dtype=np.uint8)
+        type_weights, total_confidence, total_weight, signal_counts, strong_counts = _consensus_kernel(
+            np.array(rows, dtype=np.int32),
+            np.array(codes, dtype=np.int8),
+            self.weight_table[source_codes],
+            np.array(confidences, dtype=np.float64),
+            _STRONG_TABLE[source_codes],
+            len(signal_lists)
+        )
+        type_weights = type_weights.tolist()
+        total_confidence = total_confidence.tolist()
+        total_weight = total_weight.tolist()
+        signal_counts = signal_counts.tolist()
+        strong_counts = strong_counts.tolist()
+        
+        consensus_list = []
+        for row, signals in enumerate(signal_lists):
+            buy_weight, sell_weight, hold_weight = type_weights[row]
+            
+            consensus_list.append({
+                'buy_weight': buy_weight,
+                'sell_weight': sell_weight,
+                'hold_weight': hold_weight,
+                'total_confidence': total_confidence[row],
+                'total_weight': total_weight[row],
+                'signal_reasons': signal_reasons[row],
+                'signal_counts': signal_counts[row],
+                'strong_counts': strong_counts[row],
+                'total_signals': len(signals)
+            })
+        
+        return consensus_list
     
     def _determine_final_signal(self, consensus: Dict, signals: List[Dict]) -> Dict:
         """
@@ -139,7 +292,6 @@ class SignalProcessor:
         buy_weight = consensus['buy_weight']
         sell_weight = consensus['sell_weight']
         hold_weight = consensus['hold_weight']
-        avg_confidence = consensus['avg_confidence']
         
         # Determine dominant signal
         if buy_weight > sell_weight and buy_weight > hold_weight:
@@ -150,10 +302,14 @@ class SignalProcessor:
             confidence = min(100, sell_weight / (buy_weight + sell_weight + hold_weight) * 100)
         else:
             signal_type = 'HOLD'
+            
+            # The average confidence is only needed when no side dominates
+            total_weight = consensus['total_weight']
+            avg_confidence = consensus['total_confidence'] / total_weight if total_weight > 0 else 0
             confidence = max(avg_confidence, 50)  # At least 50% confidence for HOLD
         
         # Apply additional filters for signal quality
-        confidence = self._apply_signal_filters(signal_type, confidence, signals)
+        confidence = self._apply_signal_filters(signal_type, confidence, consensus)
         
         # Build reason string
         reason = self._build_reason_string(consensus, signal_type, confidence)
@@ -162,7 +318,7 @@ class SignalProcessor:
             'signal': signal_type,
             'confidence': round(confidence, 1),
             'reason': reason,
-            'individual_signals': signals,
+            'individual_signals': _lightweight_view(signals),
             'consensus_metrics': {
                 'buy_weight': round(buy_weight, 1),
                 'sell_weight': round(sell_weight, 1),
@@ -171,40 +327,32 @@ class SignalProcessor:
             }
         }
     
-    def _apply_signal_filters(self, signal_type: str, confidence: float, signals: List[Dict]) -> float:
+    def _apply_signal_filters(self, signal_type: str, confidence: float, consensus: Dict) -> float:
         """
         Apply additional filters to adjust signal confidence.
         
         Args:
             signal_type: BUY/SELL/HOLD
             confidence: Base confidence score
-            signals: Individual signals
+            consensus: Consensus metrics with signal and strong-signal counts
             
         Returns:
             Adjusted confidence score
         """
         adjusted_confidence = confidence
-        
-        # Count signal types
-        signal_types = [s['signal'] for s in signals if 'signal' in s]
-        signal_counts = Counter(signal_types)
+        signal_counts = consensus['signal_counts']
+        code = _SIGNAL_CODES[signal_type]
         
         # Penalize if there's too much disagreement
-        total_signals = len(signal_types)
+        total_signals = consensus['total_signals']
         if total_signals > 1:
-            agreement_ratio = signal_counts.get(signal_type, 0) / total_signals
+            agreement_ratio = signal_counts[code] / total_signals
             
             if agreement_ratio < 0.6:  # Less than 60% agreement
                 adjusted_confidence *= 0.8  # Reduce confidence by 20%
         
         # Boost confidence for strong technical confluences
-        strong_indicators = ['RSI', 'MACD', 'MA Crossover']
-        strong_signal_count = sum(1 for s in signals 
-                                if s.get('source') in strong_indicators 
-                                and s.get('signal') == signal_type
-                                and s.get('confidence', 0) >= 75)
-        
-        if strong_signal_count >= 2:
+        if consensus['strong_counts'][code] >= 2:
             adjusted_confidence = min(100, adjusted_confidence * 1.1)  # Boost by 10%
         
         # Minimum confidence thresholds
@@ -237,7 +385,11 @@ class SignalProcessor:
             main_reason = f"Mixed signals from {total_signals} indicators"
         
         # Add top contributing signals
-        contributing_signals = [r for r in signal_reasons if signal_type in r][:3]  # Top 3
+        code = _SIGNAL_CODES[signal_type]
+        contributing_signals = list(islice((
+            f"{source}: {signal_type} ({confidence:.0f}%)"
+            for source, reason_code, confidence in signal_reasons if reason_code == code
+        ), 3))  # Top 3
         
         if contributing_signals:
             details = " | ".join(contributing_signals)
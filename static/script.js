@@ -89,12 +89,9 @@ class TradingBotDashboard {
         try {
             // Load all data concurrently
             await Promise.allSettled([
-                this.loadStatus(),
-                this.loadCurrentSignals(),
+                this.loadOverview(),
                 this.loadSignalHistory(),
-                this.loadErrors(),
-                this.loadConfiguration(),
-                this.loadStatistics()
+                this.loadConfiguration()
             ]);
         } catch (error) {
             console.error('Error loading data:', error);
@@ -105,18 +102,22 @@ class TradingBotDashboard {
         }
     }
     
-    async loadStatus() {
+    async loadOverview() {
+        // Status, current signals, errors and statistics in one request
         try {
-            const response = await fetch('/api/status');
+            const response = await fetch('/api/all');
             const data = await response.json();
             
             if (data.success) {
-                this.updateStatusDisplay(data.data);
+                this.updateStatusDisplay(data.data.status);
+                this.displayCurrentSignals(data.data.signals);
+                this.displayErrors(data.data.errors);
+                this.displayStatistics(data.data.stats);
             } else {
-                throw new Error(data.error || 'Failed to load status');
+                throw new Error(data.error || 'Failed to load dashboard data');
             }
         } catch (error) {
-            console.error('Error loading status:', error);
+            console.error('Error loading dashboard data:', error);
             this.updateStatusDisplay({
                 running: false,
                 last_run: 'Error',
@@ -124,22 +125,9 @@ class TradingBotDashboard {
                 errors: [],
                 current_signals: {}
             });
-        }
-    }
-    
-    async loadCurrentSignals() {
-        try {
-            const response = await fetch('/api/signals/current');
-            const data = await response.json();
-            
-            if (data.success) {
-                this.displayCurrentSignals(data.data);
-            } else {
-                throw new Error(data.error || 'Failed to load current signals');
-            }
-        } catch (error) {
-            console.error('Error loading current signals:', error);
             this.displayCurrentSignals([]);
+            this.displayErrors({ recent_errors: [], error_history: [] });
+            this.displayStatistics({});
         }
     }
     
@@ -774,7 +762,7 @@ class TradingBotDashboard {
 
 // Initialize dashboard when DOM is loaded
 document.addEventListener('DOMContentLoaded', () => {
-    new TradingBotDashboard();
+    window.tradingBotDashboard = new TradingBotDashboard();
 });
 
 // Handle page visibility changes for auto-refresh
@@ -786,6 +774,8 @@ document.addEventListener('visibilitychange', () => {
         } else {
             const autoRefreshCheckbox = document.getElementById('auto-refresh');
             if (autoRefreshCheckbox && autoRefreshCheckbox.checked) {
+                // Catch up on what changed while hidden, then resume polling
+                dashboard.loadAllData();
                 dashboard.startAutoRefresh();
             }
         }
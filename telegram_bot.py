@@ -3,21 +3,69 @@ Telegram bot integration for sending trading alerts.
 Handles message formatting and delivery to Telegram chat.
 """
 
-import aiohttp
 import asyncio
 import logging
-from typing import Optional
+import time
+from functools import lru_cache
+from typing import List, Optional
 from datetime import datetime
 
-from config import Config
+from config import CONFIG
+from api_handlers import get_shared_session
+
+try:
+    import orjson
+except ImportError:  # orjson is optional, aiohttp's stdlib json encoding is used instead
+    orjson = None
+
+_JSON_HEADERS = {'Content-Type': 'application/json'}
+
+# Trading alert layout, filled in per alert with str.format_map
+_ALERT_TEMPLATE = """🎯 <b>TRADING SIGNAL ALERT</b>
+            
+{emoji} <b>Pair:</b> {symbol}
+📊 <b>Signal:</b> {signal}
+💰 <b>Entry:</b> ${entry:.4f}
+🛑 <b>Stop Loss:</b> ${stop_loss:.4f}
+🎯 <b>Take Profit:</b> ${take_profit:.4f}
+⏰ <b>Timeframe:</b> 15min to 1hr
+🔥 <b>Confidence:</b> {confidence:.1f}%
+📈 <b>Risk/Reward:</b> 1:{risk_reward:.1f}
+📦 <b>Position Size:</b> {position_size}
+
+💡 <b>Analysis:</b> {reason}
+
+⏰ <b>Time:</b> {timestamp}
+
+<i>⚠️ This is not financial advice. Trade at your own risk.</i>"""
+
+# (emoji, stop loss, take profit) per signal type; stop and target are multiples of the entry
+_ALERT_LEVELS = {
+    'BUY': ("🟢", 0.98, 1.04),   # 2% stop loss, 4% take profit
+    'SELL': ("🔴", 1.02, 0.96),  # 2% stop loss, 4% take profit
+}
+_NEUTRAL_LEVELS = ("⚪", 1.0, 1.0)
+
+# Messages sent together are joined with this separator, up to Telegram's size limit
+_BATCH_SEPARATOR = "\n\n———\n\n"
+_MESSAGE_LIMIT = 4096
+
+@lru_cache(maxsize=2)
+def _format_second(second: int) -> str:
+    """Format a whole epoch second for messages."""
+    return datetime.fromtimestamp(second).strftime("%Y-%m-%d %H:%M:%S UTC")
+
+def _timestamp() -> str:
+    """Current time as shown in messages, formatted at most once per second."""
+    return _format_second(int(time.time()))
 
 class TelegramBot:
     """Handle Telegram bot operations for sending trading alerts."""
     
     def __init__(self):
-        self.config = Config()
+        self.config = CONFIG
         self.logger = logging.getLogger(__name__)
-        self.session = None
+        self._send_url = f"https://api.telegram.org/bot{self.config.TELEGRAM_BOT_TOKEN}/sendMessage"
         
         # Validate Telegram configuration
         if not self.config.TELEGRAM_BOT_TOKEN:
@@ -27,15 +75,11 @@ class TelegramBot:
     
     async def __aenter__(self):
         """Async context manager entry."""
-        self.session = aiohttp.ClientSession(
-            timeout=aiohttp.ClientTimeout(total=30)
-        )
         return self
     
     async def __aexit__(self, exc_type, exc_val, exc_tb):
-        """Async context manager exit."""
-        if self.session:
-            await self.session.close()
+        """Async context manager exit (the shared session outlives this bot)."""
+        pass
     
     async def send_message(self, message: str, parse_mode: str = 'HTML') -> bool:
         """
@@ -53,12 +97,8 @@ class TelegramBot:
             return False
         
         try:
-            if not self.session:
-                self.session = aiohttp.ClientSession(
-                    timeout=aiohttp.ClientTimeout(total=30)
-                )
-            
-            url = f"https://api.telegram.org/bot{self.config.TELEGRAM_BOT_TOKEN}/sendMessage"
+            # Pooled keep-alive connections shared with the data fetcher
+            session = await get_shared_session()
             
             payload = {
                 'chat_id': self.config.TELEGRAM_CHAT_ID,
@@ -67,7 +107,12 @@ class TelegramBot:
                 'disable_web_page_preview': True
             }
             
-            async with self.session.post(url, json=payload) as response:
+            if orjson is not None:
+                request_kwargs = {'data': orjson.dumps(payload), 'headers': _JSON_HEADERS}
+            else:
+                request_kwargs = {'json': payload}
+            
+            async with session.post(self._send_url, **request_kwargs) as response:
                 if response.status == 200:
                     self.logger.info("Telegram message sent successfully")
                     return True
@@ -83,6 +128,41 @@ class TelegramBot:
             self.logger.error(f"Error sending Telegram message: {str(e)}")
             return False
     
+    async def send_messages(self, messages: List[str]) -> List[bool]:
+        """
+        Send several messages in as few Telegram messages as possible.
+        
+        Messages are joined into batches, starting a new batch only where the
+        next message would push it past Telegram's size limit, and the batches
+        are sent concurrently.
+        
+        Args:
+            messages: Message texts to send
+            
+        Returns:
+            List of bool per message: True if its batch was sent successfully
+        """
+        batches: List[List[int]] = []
+        length = 0
+        for index, message in enumerate(messages):
+            if batches and length + len(_BATCH_SEPARATOR) + len(message) <= _MESSAGE_LIMIT:
+                batches[-1].append(index)
+                length += len(_BATCH_SEPARATOR) + len(message)
+            else:
+                batches.append([index])
+                length = len(message)
+        
+        sent = await asyncio.gather(*(
+            self.send_message(_BATCH_SEPARATOR.join(messages[index] for index in batch))
+            for batch in batches
+        ))
+        
+        delivered = [False] * len(messages)
+        for batch, success in zip(batches, sent):
+            for index in batch:
+                delivered[index] = success
+        return delivered
+    
     async def send_trading_alert(self, symbol: str, signal_data: dict) -> bool:
         """
         Send a formatted trading alert message.
@@ -121,47 +201,24 @@ class TelegramBot:
             
             # Calculate entry, stop loss, and take profit
             entry_price = current_price
-            
-            if signal == 'BUY':
-                emoji = "🟢"
-                stop_loss = entry_price * 0.98  # 2% stop loss
-                take_profit = entry_price * 1.04  # 4% take profit
-            elif signal == 'SELL':
-                emoji = "🔴"
-                stop_loss = entry_price * 1.02  # 2% stop loss
-                take_profit = entry_price * 0.96  # 4% take profit
-            else:
-                emoji = "⚪"
-                stop_loss = entry_price
-                take_profit = entry_price
+            emoji, stop_factor, profit_factor = _ALERT_LEVELS.get(signal, _NEUTRAL_LEVELS)
             
             # Get risk metrics if available
             risk_metrics = signal_data.get('risk_metrics', {})
-            risk_reward = risk_metrics.get('risk_reward_ratio', 2.0)
-            position_size = risk_metrics.get('position_size_suggestion', 'Medium')
-            
-            # Format timestamp
-            timestamp = datetime.now().strftime("%Y-%m-%d %H:%M:%S UTC")
-            
-            message = f"""🎯 <b>TRADING SIGNAL ALERT</b>
-            
-{emoji} <b>Pair:</b> {symbol}
-📊 <b>Signal:</b> {signal}
-💰 <b>Entry:</b> ${entry_price:.4f}
-🛑 <b>Stop Loss:</b> ${stop_loss:.4f}
-🎯 <b>Take Profit:</b> ${take_profit:.4f}
-⏰ <b>Timeframe:</b> 15min to 1hr
-🔥 <b>Confidence:</b> {confidence:.1f}%
-📈 <b>Risk/Reward:</b> 1:{risk_reward:.1f}
-📦 <b>Position Size:</b> {position_size}
-
-💡 <b>Analysis:</b> {reason}
-
-⏰ <b>Time:</b> {timestamp}
-
-<i>⚠️ This is not financial advice. Trade at your own risk.</i>"""
             
-            return message
+            return _ALERT_TEMPLATE.format_map({
+                'emoji': emoji,
+                'symbol': symbol,
+                'signal': signal,
+                'entry': entry_price,
+                'stop_loss': entry_price * stop_factor,
+                'take_profit': entry_price * profit_factor,
+                'confidence': confidence,
+                'risk_reward': risk_metrics.get('risk_reward_ratio', 2.0),
+                'position_size': risk_metrics.get('position_size_suggestion', 'Medium'),
+                'reason': reason,
+                'timestamp': _timestamp()
+            })
             
         except Exception as e:
             self.logger.error(f"Error formatting trading alert: {str(e)}")
@@ -215,7 +272,7 @@ class TelegramBot:
             else:
                 last_run_str = "Never"
             
-            message = f"""🤖 <b>BOT STATUS UPDATE</b>
+            header = f"""🤖 <b>BOT STATUS UPDATE</b>
 
 {status_emoji} <b>Status:</b> {status_text}
 ⏰ <b>Last Run:</b> {last_run_str}
@@ -224,6 +281,9 @@ class TelegramBot:
 
 <b>📊 Current Market Signals:</b>"""
             
+            # Collect the lines and join once at the end
+            parts = [header]
+            
             # Add current signals summary
             if current_signals:
                 for symbol, data in current_signals.items():
@@ -233,20 +293,19 @@ class TelegramBot:
                     price = data.get('price', 0)
                     
                     signal_emoji = "🟢" if signal == 'BUY' else "🔴" if signal == 'SELL' else "⚪"
-                    message += f"\n{signal_emoji} {symbol}: {signal} ({confidence:.0f}%) - ${price:.4f}"
+                    parts.append(f"\n{signal_emoji} {symbol}: {signal} ({confidence:.0f}%) - ${price:.4f}")
             else:
-                message += "\nNo active signals"
+                parts.append("\nNo active signals")
             
             # Add recent errors if any
             if errors:
-                message += f"\n\n<b>⚠️ Recent Errors:</b>"
+                parts.append("\n\n<b>⚠️ Recent Errors:</b>")
                 for error in errors[-3:]:  # Show last 3 errors
-                    message += f"\n• {error}"
+                    parts.append(f"\n• {error}")
             
-            timestamp = datetime.now().strftime("%Y-%m-%d %H:%M:%S UTC")
-            message += f"\n\n<i>Updated: {timestamp}</i>"
+            parts.append(f"\n\n<i>Updated: {_timestamp()}</i>")
             
-            return message
+            return "".join(parts)
             
         except Exception as e:
             self.logger.error(f"Error formatting status message: {str(e)}")
@@ -263,7 +322,7 @@ class TelegramBot:
             bool: True if error alert sent successfully
         """
         try:
-            timestamp = datetime.now().strftime("%Y-%m-%d %H:%M:%S UTC")
+            timestamp = _timestamp()
             
             message = f"""🚨 <b>BOT ERROR ALERT</b>
 
@@ -286,7 +345,7 @@ class TelegramBot:
             bool: True if connection successful
         """
         try:
-            test_message = f"🧪 Bot connection test - {datetime.now().strftime('%Y-%m-%d %H:%M:%S UTC')}"
+            test_message = f"🧪 Bot connection test - {_timestamp()}"
             return await self.send_message(test_message)
             
         except Exception as e:
@@ -294,6 +353,5 @@ class TelegramBot:
             return False
     
     async def close(self):
-        """Close the aiohttp session."""
-        if self.session:
-            await self.session.close()
+        """Release the bot (the shared session is closed by its owner, not here)."""
+        pass
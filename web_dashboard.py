@@ -3,35 +3,219 @@ Web dashboard for monitoring the Trading Signal Bot.
 Provides real-time status, signal history, and bot controls.
 """
 
-from flask import Flask, render_template, jsonify, request
-import json
+from flask import Flask, g, jsonify, request
+from flask.json.provider import DefaultJSONProvider
+import gzip
+import os
+import time
 from datetime import datetime
+from functools import wraps
 import logging
 
+from config import CONFIG
+from logger import SignalStats, tail_jsonl
+
+try:
+    import orjson
+except ImportError:  # orjson is optional, Flask's stdlib json provider is used instead
+    orjson = None
+
+class _OrjsonProvider(DefaultJSONProvider):
+    """JSON provider that serializes jsonify() responses with orjson."""
+    
+    def dumps(self, obj, **kwargs) -> str:
+        return self._encode(obj).decode('utf-8')
+    
+    def response(self, *args, **kwargs):
+        # Send orjson's bytes as the body directly, without a str round trip
+        obj = self._prepare_response_obj(args, kwargs)
+        return self._app.response_class(self._encode(obj), mimetype=self.mimetype)
+    
+    def _encode(self, obj) -> bytes:
+        return orjson.dumps(
+            obj,
+            default=self.default,
+            option=orjson.OPT_SERIALIZE_NUMPY | orjson.OPT_NON_STR_KEYS
+        )
+
 # Initialize Flask app
 app = Flask(__name__)
 app.config['SECRET_KEY'] = 'trading_bot_dashboard_2024'
+if orjson is not None:
+    app.json = _OrjsonProvider(app)
+app.json.compact = True  # Never indent API responses, even in debug mode
 
 # Setup logger for web dashboard
 logger = logging.getLogger(__name__)
 
+# Upper bound for user-supplied history limits, so a huge ?limit= cannot make
+# a request buffer most of a log file
+_MAX_HISTORY_LINES = 5000
+
+# Safe configuration (no sensitive data); CONFIG is fixed for the process
+_SAFE_CONFIG = {
+    'trading_symbols': CONFIG.TRADING_SYMBOLS,
+    'confidence_threshold': CONFIG.CONFIDENCE_THRESHOLD,
+    'rsi_period': CONFIG.RSI_PERIOD,
+    'macd_periods': {
+        'fast': CONFIG.MACD_FAST_PERIOD,
+        'slow': CONFIG.MACD_SLOW_PERIOD,
+        'signal': CONFIG.MACD_SIGNAL_PERIOD
+    },
+    'bollinger_period': CONFIG.BOLLINGER_PERIOD,
+    'ma_periods': {
+        'short': CONFIG.MA_SHORT_PERIOD,
+        'long': CONFIG.MA_LONG_PERIOD
+    },
+    'telegram_configured': bool(CONFIG.TELEGRAM_BOT_TOKEN and CONFIG.TELEGRAM_CHAT_ID)
+}
+_SAFE_CONFIG_BODY = app.json.dumps({'success': True, 'data': _SAFE_CONFIG}).encode('utf-8')
+
+# Responses at least this large are gzipped for clients that accept it
+_COMPRESS_MIN_SIZE = 512
+_COMPRESS_MIMETYPES = frozenset(('application/json', 'text/html', 'text/plain'))
+
+# Signal totals for /api/stats, updated from the newly appended log lines
+_signal_stats = SignalStats('signals.log')
+
+def _ttl_cached(ttl: float):
+    """
+    Reuse a read-only endpoint's encoded response for ttl seconds.
+    
+    Every open dashboard tab polls the same endpoints, so within the TTL they
+    share one computation and JSON encoding instead of repeating it.
+    
+    Args:
+        ttl: Seconds a response is reused
+        
+    Returns:
+        Decorator for a view function
+    """
+    def decorator(view):
+        cached = None  # (expiry, body, status, mimetype)
+        
+        @wraps(view)
+        def wrapper(*args, **kwargs):
+            nonlocal cached
+            now = time.monotonic()
+            
+            if cached is None or now >= cached[0]:
+                response = app.make_response(view(*args, **kwargs))
+                cached = (now + ttl, response.get_data(), response.status_code, response.mimetype)
+            
+            _, body, status, mimetype = cached
+            return app.response_class(body, status=status, mimetype=mimetype)
+        
+        return wrapper
+    
+    return decorator
+
 # Global bot instance (will be set by main.py)
 app.bot = None
 
+def _bot_status() -> dict:
+    """Get the bot status snapshot, taken at most once per request."""
+    if 'bot_status' not in g:
+        g.bot_status = app.bot.get_status()
+    return g.bot_status
+
+def _format_current_signals(status: dict) -> list:
+    """Format the current signals of a status snapshot for display."""
+    formatted_signals = []
+    for symbol, data in status.get('current_signals', {}).items():
+        consensus = data.get('consensus', {})
+        formatted_signals.append({
+            'symbol': symbol,
+            'signal': consensus.get('signal', 'HOLD'),
+            'confidence': consensus.get('confidence', 0),
+            'price': data.get('price', 0),
+            'timestamp': data.get('timestamp', ''),
+            'reason': consensus.get('reason', 'No analysis available'),
+            'individual_signals': consensus.get('individual_signals', [])
+        })
+    return formatted_signals
+
+def _error_data(status: dict, limit: int) -> dict:
+    """Combine a status snapshot's recent errors with the end of the error log."""
+    return {
+        'recent_errors': status.get('errors', []),
+        'error_history': tail_jsonl('errors.log', limit)
+    }
+
+def _stats_data(status: dict = None) -> dict:
+    """Build the statistics view; signal totals need a status snapshot."""
+    stats = {
+        'uptime': 'N/A',
+        'total_cycles': 0,
+        'successful_cycles': 0,
+        'total_signals': 0,
+        'signals_by_type': {'BUY': 0, 'SELL': 0, 'HOLD': 0},
+        'avg_confidence': 0,
+        'api_success_rate': 0
+    }
+    
+    if status is not None:
+        stats['total_signals'] = status.get('total_signals_sent', 0)
+        
+        # Signal totals from the log file, without rescanning it
+        signal_stats = _signal_stats.refresh()
+        signal_count = signal_stats['count']
+        
+        for signal in stats['signals_by_type']:
+            stats['signals_by_type'][signal] = signal_stats['by_type'].get(signal, 0)
+        
+        if signal_count > 0:
+            stats['avg_confidence'] = signal_stats['confidence_sum'] / signal_count
+            stats['total_cycles'] = signal_count
+            stats['successful_cycles'] = signal_count  # Simplified
+    
+    return stats
+
 @app.route('/')
 def dashboard():
-    """Main dashboard page."""
-    return render_template('dashboard.html')
+    """Main dashboard page (a static file; data is loaded through the API)."""
+    response = app.send_static_file('dashboard.html')
+    response.cache_control.no_cache = None
+    response.cache_control.public = True
+    response.cache_control.max_age = 3600
+    return response
 
 @app.route('/api/status')
+@_ttl_cached(1.0)
 def get_status():
     """Get current bot status."""
     try:
         if app.bot:
-            status = app.bot.get_status()
             return jsonify({
                 'success': True,
-                'data': status
+                'data': _bot_status()
+            })
+        else:
+            return jsonify({
+                'success': False,
+                'error': 'Bot not initialized'
+            })
+    except Exception as e:
+        return jsonify({
+            'success': False,
+            'error': str(e)
+        })
+
+@app.route('/api/all')
+@_ttl_cached(1.0)
+def get_all():
+    """Get status, current signals, errors and statistics from one status snapshot."""
+    try:
+        if app.bot:
+            status = _bot_status()
+            return jsonify({
+                'success': True,
+                'data': {
+                    'status': status,
+                    'signals': _format_current_signals(status),
+                    'errors': _error_data(status, 20),
+                    'stats': _stats_data(status)
+                }
             })
         else:
             return jsonify({
@@ -45,30 +229,14 @@ def get_status():
         })
 
 @app.route('/api/signals/current')
+@_ttl_cached(1.0)
 def get_current_signals():
     """Get current trading signals."""
     try:
         if app.bot:
-            status = app.bot.get_status()
-            current_signals = status.get('current_signals', {})
-            
-            # Format signals for display
-            formatted_signals = []
-            for symbol, data in current_signals.items():
-                consensus = data.get('consensus', {})
-                formatted_signals.append({
-                    'symbol': symbol,
-                    'signal': consensus.get('signal', 'HOLD'),
-                    'confidence': consensus.get('confidence', 0),
-                    'price': data.get('price', 0),
-                    'timestamp': data.get('timestamp', ''),
-                    'reason': consensus.get('reason', 'No analysis available'),
-                    'individual_signals': consensus.get('individual_signals', [])
-                })
-            
             return jsonify({
                 'success': True,
-                'data': formatted_signals
+                'data': _format_current_signals(_bot_status())
             })
         else:
             return jsonify({
@@ -85,26 +253,31 @@ def get_current_signals():
 def get_signal_history():
     """Get signal history."""
     try:
-        limit = request.args.get('limit', 50, type=int)
+        limit = min(request.args.get('limit', 50, type=int), _MAX_HISTORY_LINES)
         
-        # Try to read from signal log file
-        history = []
+        # The log only ever changes by being written, so its mtime and size
+        # identify the history; unchanged polls get an empty 304
         try:
-            with open('signals.log', 'r', encoding='utf-8') as f:
-                lines = f.readlines()[-limit:]
-                for line in lines:
-                    try:
-                        signal_data = json.loads(line.strip())
-                        history.append(signal_data)
-                    except json.JSONDecodeError:
-                        continue
+            stat = os.stat('signals.log')
+            etag = f"{stat.st_mtime_ns:x}-{stat.st_size:x}-{limit}"
         except FileNotFoundError:
-            pass  # No history file yet
+            etag = None
         
-        return jsonify({
-            'success': True,
-            'data': history
-        })
+        if etag and request.if_none_match.contains_weak(etag):
+            response = app.response_class(status=304)
+        else:
+            # Read only the end of the signal log file (empty if there is none yet)
+            history = tail_jsonl('signals.log', limit)
+            
+            response = jsonify({
+                'success': True,
+                'data': history
+            })
+        
+        if etag:
+            response.set_etag(etag)
+            response.headers['Cache-Control'] = 'no-cache'
+        return response
     except Exception as e:
         return jsonify({
             'success': False,
@@ -116,30 +289,12 @@ def get_errors():
     """Get recent errors."""
     try:
         if app.bot:
-            status = app.bot.get_status()
-            errors = status.get('errors', [])
-            
-            # Also try to read from error log file
-            error_history = []
-            try:
-                limit = request.args.get('limit', 20, type=int)
-                with open('errors.log', 'r', encoding='utf-8') as f:
-                    lines = f.readlines()[-limit:]
-                    for line in lines:
-                        try:
-                            error_data = json.loads(line.strip())
-                            error_history.append(error_data)
-                        except json.JSONDecodeError:
-                            continue
-            except FileNotFoundError:
-                pass
+            # Recent errors plus the end of the error log file
+            limit = min(request.args.get('limit', 20, type=int), _MAX_HISTORY_LINES)
             
             return jsonify({
                 'success': True,
-                'data': {
-                    'recent_errors': errors,
-                    'error_history': error_history
-                }
+                'data': _error_data(_bot_status(), limit)
             })
         else:
             return jsonify({
@@ -154,53 +309,16 @@ def get_errors():
 
 @app.route('/api/config')
 def get_config():
-    """Get bot configuration."""
-    try:
-        from config import Config
-        config = Config()
-        
-        # Return safe configuration (no sensitive data)
-        safe_config = {
-            'trading_symbols': config.TRADING_SYMBOLS,
-            'confidence_threshold': config.CONFIDENCE_THRESHOLD,
-            'rsi_period': config.RSI_PERIOD,
-            'macd_periods': {
-                'fast': config.MACD_FAST_PERIOD,
-                'slow': config.MACD_SLOW_PERIOD,
-                'signal': config.MACD_SIGNAL_PERIOD
-            },
-            'bollinger_period': config.BOLLINGER_PERIOD,
-            'ma_periods': {
-                'short': config.MA_SHORT_PERIOD,
-                'long': config.MA_LONG_PERIOD
-            },
-            'telegram_configured': bool(config.TELEGRAM_BOT_TOKEN and config.TELEGRAM_CHAT_ID)
-        }
-        
-        return jsonify({
-            'success': True,
-            'data': safe_config
-        })
-    except Exception as e:
-        return jsonify({
-            'success': False,
-            'error': str(e)
-        })
+    """Get bot configuration (encoded once at import)."""
+    return app.response_class(_SAFE_CONFIG_BODY, mimetype=app.json.mimetype)
 
 @app.route('/api/test-telegram', methods=['POST'])
 def test_telegram():
     """Test Telegram connection."""
     try:
         if app.bot:
-            # Import here to avoid circular imports
-            import asyncio
-            from telegram_bot import TelegramBot
-            
-            async def test_connection():
-                telegram_bot = TelegramBot()
-                return await telegram_bot.test_connection()
-            
-            success = asyncio.run(test_connection())
+            # Send through the bot's own loop and Telegram session
+            success = app.bot.run_coroutine(app.bot.telegram_bot.test_connection())
             
             return jsonify({
                 'success': success,
@@ -222,8 +340,6 @@ def trigger_analysis():
     """Manually trigger analysis cycle."""
     try:
         if app.bot:
-            import asyncio
-            
             # Queue a manual analysis - safer approach
             try:
                 app.bot.manual_analysis_requested = True
@@ -293,55 +409,13 @@ def stop_bot():
         })
 
 @app.route('/api/stats')
+@_ttl_cached(2.0)
 def get_stats():
     """Get bot statistics."""
     try:
-        stats = {
-            'uptime': 'N/A',
-            'total_cycles': 0,
-            'successful_cycles': 0,
-            'total_signals': 0,
-            'signals_by_type': {'BUY': 0, 'SELL': 0, 'HOLD': 0},
-            'avg_confidence': 0,
-            'api_success_rate': 0
-        }
-        
-        if app.bot:
-            status = app.bot.get_status()
-            stats['total_signals'] = status.get('total_signals_sent', 0)
-            
-            # Try to calculate stats from log files
-            try:
-                # Read signal history
-                with open('signals.log', 'r', encoding='utf-8') as f:
-                    signal_count = 0
-                    confidence_sum = 0
-                    
-                    for line in f:
-                        try:
-                            signal_data = json.loads(line.strip())
-                            signal = signal_data.get('signal', 'HOLD')
-                            confidence = signal_data.get('confidence', 0)
-                            
-                            if signal in stats['signals_by_type']:
-                                stats['signals_by_type'][signal] += 1
-                            
-                            confidence_sum += confidence
-                            signal_count += 1
-                        except json.JSONDecodeError:
-                            continue
-                    
-                    if signal_count > 0:
-                        stats['avg_confidence'] = confidence_sum / signal_count
-                        stats['total_cycles'] = signal_count
-                        stats['successful_cycles'] = signal_count  # Simplified
-                        
-            except FileNotFoundError:
-                pass
-        
         return jsonify({
             'success': True,
-            'data': stats
+            'data': _stats_data(_bot_status() if app.bot else None)
         })
     except Exception as e:
         return jsonify({
@@ -349,6 +423,31 @@ def get_stats():
             'error': str(e)
         })
 
+@app.after_request
+def compress_response(response):
+    """Gzip large text and JSON responses when the client accepts gzip."""
+    if (response.status_code != 200
+            or response.direct_passthrough
+            or 'Content-Encoding' in response.headers
+            or response.mimetype not in _COMPRESS_MIMETYPES
+            or 'gzip' not in request.headers.get('Accept-Encoding', '')):
+        return response
+    
+    body = response.get_data()
+    if len(body) < _COMPRESS_MIN_SIZE:
+        return response
+    
+    response.set_data(gzip.compress(body, compresslevel=6))
+    response.headers['Content-Encoding'] = 'gzip'
+    response.vary.add('Accept-Encoding')
+    
+    # The compressed bytes differ from the identity body, so the tag turns weak
+    etag, weak = response.get_etag()
+    if etag and not weak:
+        response.set_etag(etag, weak=True)
+    
+    return response
+
 @app.errorhandler(404)
 def not_found(error):
     """Handle 404 errors."""